@@ -0,0 +1,123 @@
+"""
+Standard-webhooks (svix) signing helpers shared by the Vercel functions.
+
+Used for two hops:
+  - Fathom → api/webhook.py   (secret: FATHOM_WEBHOOK_SECRET)
+  - QStash → api/process.py   (secret: PIPELINE_SECRET, signed by webhook.py)
+
+The leading underscore keeps Vercel from deploying this file as a function.
+
+Signing convention:
+  signed_content = "{webhook-id}.{webhook-timestamp}.{raw_body}"
+  secret_bytes   = base64.b64decode( secret.removeprefix("whsec_") )
+  expected_sig   = base64.b64encode( HMAC-SHA256(secret_bytes, signed_content) )
+  webhook-signature header: space-separated "v1,{sig}" entries
+"""
+
+import hmac
+import hashlib
+import base64
+import os
+import sys
+import time
+from typing import Optional
+
+# CPython's hashlib.sha256 normally wraps OpenSSL (module "_hashlib"), and
+# hmac.new() then runs entirely inside OpenSSL, which uses the CPU's SHA
+# extensions (SHA-NI on x86_64) when present. If a packaging change ever drops
+# us onto the builtin _sha256 fallback, HMAC over large transcript bodies gets
+# several times slower — say so once per cold start rather than silently.
+if hashlib.sha256.__module__ != "_hashlib":
+    print(
+        f"WARNING: hashlib.sha256 is not OpenSSL-backed ({hashlib.sha256.__module__}); "
+        "webhook signature checks will use the slow builtin SHA-256",
+        file=sys.stderr,
+    )
+
+
+# A real header is a handful of "v1,<44-char base64>" entries (more than one
+# only during secret rotation). Anything longer is rejected before hashing.
+MAX_SIGNATURE_HEADER = 512
+
+
+def decode_secret(secret_raw: str) -> bytes:
+    """Strip the whsec_ prefix and base64-decode. Raises on malformed input."""
+    return base64.b64decode(secret_raw.removeprefix("whsec_"))
+
+
+def load_hmac_key(env_var: str) -> Optional[hmac.HMAC]:
+    """
+    Build a keyed HMAC-SHA256 template from a whsec_ secret in the environment.
+
+    Called once at module import: the secret never changes within a process,
+    and warm Vercel instances serve many requests. Per request the template is
+    .copy()'d, which also skips re-keying SHA-256 (hashing the padded key
+    block). Returns None (after logging) if the variable is missing or invalid.
+    """
+    secret_raw = os.environ.get(env_var, "")
+    if not secret_raw:
+        print(f"ERROR: {env_var} not set", file=sys.stderr)
+        return None
+
+    try:
+        return hmac.new(decode_secret(secret_raw), None, hashlib.sha256)
+    except Exception as e:
+        print(f"ERROR: Failed to decode {env_var}: {e}", file=sys.stderr)
+        return None
+
+
+def compute_signature(hmac_key: hmac.HMAC, msg_id: str, msg_timestamp: str, raw_body: bytes) -> str:
+    """Return the base64 HMAC-SHA256 signature (without the "v1," prefix)."""
+    # Feed the prefix and the raw body separately: no decode/encode round trip
+    # of the (possibly large) body and no prefix + body concatenation copy.
+    h = hmac_key.copy()
+    h.update(f"{msg_id}.{msg_timestamp}.".encode("utf-8"))
+    h.update(raw_body)
+    return base64.b64encode(h.digest()).decode("ascii")
+
+
+def verify_signature(raw_body: bytes, headers: dict, hmac_key: hmac.HMAC, tolerance: int) -> bool:
+    """Verify a standard-webhooks HMAC-SHA256 signature. Never raises."""
+    msg_id        = headers.get("webhook-id", "")
+    msg_timestamp = headers.get("webhook-timestamp", "")
+    msg_signature = headers.get("webhook-signature", "")
+
+    if not all([msg_id, msg_timestamp, msg_signature]):
+        print("ERROR: Missing required signature headers", file=sys.stderr)
+        return False
+
+    if len(msg_signature) > MAX_SIGNATURE_HEADER:
+        print(f"ERROR: webhook-signature header longer than {MAX_SIGNATURE_HEADER} chars", file=sys.stderr)
+        return False
+
+    # --- Timestamp freshness — reject replays outside the tolerance window ---
+    try:
+        ts = int(msg_timestamp)
+    except ValueError:
+        print("ERROR: webhook-timestamp is not an integer", file=sys.stderr)
+        return False
+
+    if abs(int(time.time()) - ts) > tolerance:
+        print(f"ERROR: Timestamp {ts} outside {tolerance}s tolerance", file=sys.stderr)
+        return False
+
+    # --- Compute expected signature ---
+    expected = compute_signature(hmac_key, msg_id, msg_timestamp, raw_body).encode("ascii")
+
+    # --- Compare against each v1 signature in the header ---
+    # Multiple entries are space-separated; multiple may exist during secret rotation.
+    # Scan by index over the encoded header instead of split()ing into lists.
+    header = msg_signature.encode("utf-8")
+    view   = memoryview(header)
+    start  = 0
+    while start < len(header):
+        end = header.find(b" ", start)
+        if end == -1:
+            end = len(header)
+        if header.startswith(b"v1,", start, end):
+            if hmac.compare_digest(expected, view[start + 3:end]):
+                return True
+        start = end + 1
+
+    print("ERROR: No matching v1 signature found", file=sys.stderr)
+    return False
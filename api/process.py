@@ -0,0 +1,195 @@
+"""
+Pipeline worker endpoint for Vercel serverless.
+
+api/webhook.py acknowledges Fathom immediately and publishes the normalized
+transcript to Upstash QStash, which delivers it here. This function runs the
+slow part — summarize_with_gemini → log_to_airtable — in-process.
+
+Request body (JSON):
+    {"recording_id": "...", "transcript": {<normalized transcript dict>}}
+
+The request is signed by webhook.py with PIPELINE_SECRET using the same
+standard-webhooks scheme Fathom uses (see api/_signing.py). QStash forwards
+the webhook-* headers untouched.
+
+A non-2xx response makes QStash retry the delivery.
+
+Environment variables (set in Vercel dashboard):
+    PIPELINE_SECRET         — shared secret between webhook.py and this function
+    GOOGLE_GEMINI_API_KEY   — read by summarize_with_gemini
+    AIRTABLE_API_KEY        — read by log_to_airtable
+    AIRTABLE_BASE_ID        — read by log_to_airtable
+    AIRTABLE_MEETINGS_TABLE — optional, defaults to "Meetings"
+    AIRTABLE_TASKS_TABLE    — optional, defaults to "Tasks"
+    AIRTABLE_LINK_TASKS     — optional, 1 to also write task links onto the meeting
+"""
+
+import os
+import sys
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+import orjson
+
+# ---------------------------------------------------------------------------
+# DYNAMIC IMPORTS
+# ---------------------------------------------------------------------------
+# Force line buffering to ensure logs appear in Vercel console immediately
+sys.stdout.reconfigure(line_buffering=True)
+
+# tools/ is a sibling of api/ at the project root.
+# __file__ = api/process.py  →  .parent = api/  →  .parent.parent = project root
+API_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = API_DIR.parent / "tools"
+for _dir in (API_DIR, TOOLS_DIR):
+    if str(_dir) not in sys.path:
+        sys.path.append(str(_dir))
+
+from _signing import load_hmac_key, verify_signature
+
+try:
+    import summarize_with_gemini as summarizer
+    import log_to_airtable as logger
+    print("DEBUG: Successfully imported summarizer and logger tools")
+except ImportError as e:
+    print(f"CRITICAL ERROR: Failed to import tools: {e}", file=sys.stderr)
+    # We don't exit here because this is a serverless module, but we mark them as None
+    # to avoid NameError and handle them in the pipeline.
+    summarizer = None
+    logger = None
+
+
+# ---------------------------------------------------------------------------
+# CONSTANTS
+# ---------------------------------------------------------------------------
+
+# QStash retries with backoff, so a redelivery can legitimately arrive well
+# after the original publish. Still bounded to reject stale replays.
+TIMESTAMP_TOLERANCE = 3600  # 1 hour
+
+# Keyed once per cold start; see _signing.load_hmac_key
+PIPELINE_HMAC = load_hmac_key("PIPELINE_SECRET") if os.environ.get("PIPELINE_SECRET") else None
+
+
+# ---------------------------------------------------------------------------
+# PIPELINE
+# ---------------------------------------------------------------------------
+
+
+def check_tools():
+    """Verify tools were imported successfully."""
+    if summarizer is None or logger is None:
+        raise RuntimeError("Tools (summarizer/logger) failed to import. Check requirements.txt and logs.")
+
+def run_pipeline(recording_id: str, normalized: dict) -> None:
+    """Execute summarize → log_to_airtable in-process, passing dicts in memory."""
+    check_tools()
+
+    # Fail fast on missing env vars
+    for var in ("GOOGLE_GEMINI_API_KEY", "AIRTABLE_API_KEY", "AIRTABLE_BASE_ID"):
+        if not os.environ.get(var):
+            raise EnvironmentError(f"Required env var {var} is not set")
+
+    # Step 1: Summarize with Gemini (Hebrew summary + action items)
+    print("--- summarize_with_gemini ---")
+    summary = summarizer.run(normalized)
+
+    # Step 2: Log meeting + tasks to Airtable
+    print("--- log_to_airtable ---")
+    logger.run(summary, normalized, recording_id)
+
+
+def run_job(recording_id: str, normalized: dict) -> tuple:
+    """
+    Run the pipeline and map the outcome to (HTTP status, JSON body).
+    Never raises. 200 only on full success (non-2xx triggers a retry
+    from whoever delivered the job — QStash or Fathom).
+    """
+    try:
+        run_pipeline(recording_id, normalized)
+
+    except EnvironmentError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 500, {"error": str(e)}
+    except RuntimeError as e:
+        print(f"ERROR: Pipeline step failed: {e}", file=sys.stderr)
+        return 500, {"error": str(e)}
+    except (summarizer.GeminiAPIError, logger.AirtableError) as e:
+        print(f"ERROR: Pipeline step failed: {e}", file=sys.stderr)
+        return 500, {"error": str(e)}
+    except Exception as e:
+        print(f"ERROR: Unexpected: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return 500, {"error": "Unexpected error"}
+
+    return 200, {
+        "status":       "ok",
+        "recording_id": recording_id,
+        "title":        normalized.get("title"),
+    }
+
+
+def verify_pipeline_signature(raw_body: bytes, headers: dict) -> bool:
+    """Verify the webhook.py → process.py signature. Never raises."""
+    if PIPELINE_HMAC is None:
+        print("ERROR: PIPELINE_SECRET missing or invalid", file=sys.stderr)
+        return False
+
+    return verify_signature(raw_body, headers, PIPELINE_HMAC, TIMESTAMP_TOLERANCE)
+
+
+# ---------------------------------------------------------------------------
+# HTTP HANDLER
+# ---------------------------------------------------------------------------
+# Vercel Python serverless: the class MUST be named `handler` and extend
+# BaseHTTPRequestHandler.  Vercel auto-discovers it by name.
+# ---------------------------------------------------------------------------
+
+
+class handler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length == 0:
+            self._json(400, {"error": "Empty body"})
+            return
+        raw_body = self.rfile.read(length)
+
+        # --- Verify internal HMAC signature ---
+        sig_headers = {
+            "webhook-id":        self.headers.get("webhook-id", ""),
+            "webhook-timestamp": self.headers.get("webhook-timestamp", ""),
+            "webhook-signature": self.headers.get("webhook-signature", ""),
+        }
+        if not verify_pipeline_signature(raw_body, sig_headers):
+            self._json(401, {"error": "Invalid signature"})
+            return
+
+        # --- Parse JSON ---
+        try:
+            job = orjson.loads(raw_body)
+            recording_id = job["recording_id"]
+            normalized   = job["transcript"]
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"ERROR: Malformed job: {e}", file=sys.stderr)
+            self._json(400, {"error": "Malformed job"})
+            return
+
+        print(f"Processing: title='{normalized.get('title')}' recording_id='{recording_id}'")
+
+        code, body = run_job(recording_id, normalized)
+        self._json(code, body)
+
+    # --- helpers ---
+
+    def _json(self, code: int, body: dict):
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(orjson.dumps(body))
+
+    def log_message(self, format, *args):
+        # Suppress BaseHTTPRequestHandler's default stderr noise;
+        # we log explicitly via print() which Vercel captures.
+        pass
@@ -3,7 +3,22 @@ Fathom webhook endpoint for Vercel serverless.
 
 Receives the `new-meeting-content-ready` event, verifies the HMAC signature,
 normalizes the payload into the transcript JSON format the existing tools expect,
-then runs summarize_with_gemini.py and log_to_airtable.py as subprocesses.
+then hands it off to the pipeline worker (api/process.py) and acknowledges.
+
+Hand-off:
+  - QStash configured  → publish {recording_id, transcript} to Upstash QStash,
+                         which delivers it to api/process.py; respond 202
+                         right away so Fathom's ack doesn't wait on
+                         Gemini + Airtable.
+  - otherwise          → run the pipeline inline and respond 200 on success
+                         (the original synchronous behaviour, handy locally).
+
+The job is signed with PIPELINE_SECRET using the same standard-webhooks
+scheme Fathom uses, so api/process.py can reject anything QStash didn't
+get from us. QStash rejects message bodies over 1 MB, so the job carries only
+the segment fields the tools read (see job_segments). A job still over
+QSTASH_MAX_BODY is logged and acknowledged with 200, not retried: running it
+inline would outlive this function's 60s limit after partial Airtable writes.
 
 fetch_fathom_transcript.py is skipped — the webhook payload already contains
 the full transcript.
@@ -12,24 +27,32 @@ Signature verification uses stdlib only (hmac, hashlib, base64).
 
 Environment variables (set in Vercel dashboard):
     FATHOM_WEBHOOK_SECRET   — the whsec_... value from webhook registration
-    GOOGLE_GEMINI_API_KEY   — forwarded to subprocess
-    AIRTABLE_API_KEY        — forwarded to subprocess
-    AIRTABLE_BASE_ID        — forwarded to subprocess
+    QSTASH_TOKEN            — optional, Upstash QStash token; enables the 202 hand-off
+    QSTASH_URL              — optional, defaults to "https://qstash.upstash.io"
+    PIPELINE_WORKER_URL     — public URL of api/process.py (required with QSTASH_TOKEN)
+    PIPELINE_SECRET         — whsec_-style secret shared with api/process.py
+    GOOGLE_GEMINI_API_KEY   — read by summarize_with_gemini
+    AIRTABLE_API_KEY        — read by log_to_airtable
+    AIRTABLE_BASE_ID        — read by log_to_airtable
     AIRTABLE_MEETINGS_TABLE — optional, defaults to "Meetings"
     AIRTABLE_TASKS_TABLE    — optional, defaults to "Tasks"
+    AIRTABLE_LINK_TASKS     — optional, 1 to also write task links onto the meeting
+    DEBUG_PERSIST           — optional, save the normalized transcript under TMP_DIR
 """
 
-import hmac
-import hashlib
-import base64
-import json
 import os
+import re
 import sys
+import threading
 import time
-import subprocess
+import uuid
+import urllib.request
 from http.server import BaseHTTPRequestHandler
 from pathlib import Path
-from urllib.parse import urlparse
+from typing import Optional
+
+import msgspec
+import orjson
 
 # ---------------------------------------------------------------------------
 # DIAGNOSTICS & DYNAMIC IMPORTS
@@ -40,22 +63,18 @@ print(f"DEBUG: sys.path = {sys.path}")
 print(f"DEBUG: os.environ keys = {list(os.environ.keys())}")
 print("DEBUG: Webhook handler initializing...")
 
-# Add tools/ to sys.path so we can import the worker scripts directly.
-# This avoids subprocess environment issues on Vercel.
-TOOLS_DIR = Path(__file__).resolve().parent.parent / "tools"
-if str(TOOLS_DIR) not in sys.path:
-    sys.path.append(str(TOOLS_DIR))
+# Add api/ and tools/ to sys.path so we can import the shared helpers.
+# The heavy tool modules (Gemini, Airtable) are only imported by
+# api/process.py, which this handler imports lazily for the inline fallback.
+API_DIR = Path(__file__).resolve().parent
+TOOLS_DIR = API_DIR.parent / "tools"
+for _dir in (API_DIR, TOOLS_DIR):
+    if str(_dir) not in sys.path:
+        sys.path.append(str(_dir))
 
-try:
-    import summarize_with_gemini as summarizer
-    import log_to_airtable as logger
-    print("DEBUG: Successfully imported summarizer and logger tools")
-except ImportError as e:
-    print(f"CRITICAL ERROR: Failed to import tools: {e}", file=sys.stderr)
-    # We don't exit here because this is a serverless module, but we mark them as None
-    # to avoid NameError and handle them in the pipeline.
-    summarizer = None
-    logger = None
+from _signing import compute_signature, load_hmac_key, verify_signature as _verify
+from storage import TMP_DIR, TRANSCRIPT_JSON_OPTION
+from transcript_utils import participants, serializable
 
 
 # ---------------------------------------------------------------------------
@@ -65,79 +84,47 @@ except ImportError as e:
 # tools/ is a sibling of api/ at the project root.
 # __file__ = api/webhook.py  →  .parent = api/  →  .parent.parent = project root
 # TOOLS_DIR is now defined in the DYNAMIC IMPORTS section.
-
-# Vercel's writable filesystem. We nest .tmp inside /tmp so that
-# Path(".tmp") in the tool scripts resolves correctly when cwd="/tmp".
-TMP_DIR = Path("/tmp/.tmp")
+# TMP_DIR comes from tools/storage.py (resolves to /tmp/.tmp on Vercel).
 
 TIMESTAMP_TOLERANCE = 300  # 5 minutes
 
+# Last path segment after /recordings/ or /calls/, ignoring a trailing slash,
+# query string or fragment.
+RECORDING_URL_RE = re.compile(r"/(?:recordings|calls)/([^/?#]+)/?(?:[?#].*)?$")
+
+QSTASH_URL = os.environ.get("QSTASH_URL", "https://qstash.upstash.io")
+QSTASH_TIMEOUT = 10  # seconds — publishing is a single small POST
+QSTASH_MAX_BODY = 1_000_000  # bytes; QStash's message size limit is 1 MB
+
+# Keyed once per cold start; see _signing.load_hmac_key
+FATHOM_HMAC = load_hmac_key("FATHOM_WEBHOOK_SECRET")
+PIPELINE_HMAC = load_hmac_key("PIPELINE_SECRET") if os.environ.get("PIPELINE_SECRET") else None
+
 
 # ---------------------------------------------------------------------------
 # SIGNATURE VERIFICATION
 # ---------------------------------------------------------------------------
-# Fathom uses the standard-webhooks (svix) signing convention:
-#   signed_content = "{webhook-id}.{webhook-timestamp}.{raw_body}"
-#   secret_bytes   = base64.b64decode( secret.removeprefix("whsec_") )
-#   expected_sig   = base64.b64encode( HMAC-SHA256(secret_bytes, signed_content) )
-#   webhook-signature header: space-separated "v1,{sig}" entries
+# Fathom uses the standard-webhooks (svix) signing convention — see
+# api/_signing.py for the details.
 # ---------------------------------------------------------------------------
 
 
 def verify_signature(raw_body: bytes, headers: dict) -> bool:
     """Verify the Fathom webhook HMAC-SHA256 signature. Never raises."""
-    secret_raw = os.environ.get("FATHOM_WEBHOOK_SECRET", "")
-    if not secret_raw:
-        print("ERROR: FATHOM_WEBHOOK_SECRET not set", file=sys.stderr)
-        return False
-
-    msg_id        = headers.get("webhook-id", "")
-    msg_timestamp = headers.get("webhook-timestamp", "")
-    msg_signature = headers.get("webhook-signature", "")
-
-    if not all([msg_id, msg_timestamp, msg_signature]):
-        print("ERROR: Missing required signature headers", file=sys.stderr)
+    if FATHOM_HMAC is None:
+        print("ERROR: FATHOM_WEBHOOK_SECRET missing or invalid", file=sys.stderr)
         return False
 
-    # --- Timestamp freshness — reject replays older than 5 min ---
-    try:
-        ts = int(msg_timestamp)
-    except ValueError:
-        print("ERROR: webhook-timestamp is not an integer", file=sys.stderr)
-        return False
-
-    if abs(int(time.time()) - ts) > TIMESTAMP_TOLERANCE:
-        print(f"ERROR: Timestamp {ts} outside {TIMESTAMP_TOLERANCE}s tolerance", file=sys.stderr)
-        return False
-
-    # --- Decode secret (strip whsec_ prefix, base64-decode) ---
-    try:
-        secret_bytes = base64.b64decode(secret_raw.removeprefix("whsec_"))
-    except Exception as e:
-        print(f"ERROR: Failed to decode webhook secret: {e}", file=sys.stderr)
-        return False
-
-    # --- Compute expected signature ---
-    signed_content = f"{msg_id}.{msg_timestamp}.{raw_body.decode('utf-8')}"
-    expected = base64.b64encode(
-        hmac.new(secret_bytes, signed_content.encode("utf-8"), hashlib.sha256).digest()
-    ).decode("utf-8")
-
-    # --- Compare against each v1 signature in the header ---
-    # Multiple entries are space-separated; multiple may exist during secret rotation.
-    for entry in msg_signature.split(" "):
-        parts = entry.split(",", 1)  # split on first comma only
-        if len(parts) == 2 and parts[0] == "v1":
-            if hmac.compare_digest(expected, parts[1]):
-                return True
-
-    print("ERROR: No matching v1 signature found", file=sys.stderr)
-    return False
+    return _verify(raw_body, headers, FATHOM_HMAC, TIMESTAMP_TOLERANCE)
 
 
 # ---------------------------------------------------------------------------
 # PAYLOAD NORMALIZATION
 # ---------------------------------------------------------------------------
+# The payload is decoded straight into FathomWebhook, which declares only the
+# fields below. msgspec skips every other key (summary, action items,
+# thumbnails, ...) at the C layer without building Python objects for them.
+#
 # Webhook field  →  transcript file field (what the tools read)
 #   meeting_title   →  title
 #   created_at      →  date
@@ -150,7 +137,15 @@ def verify_signature(raw_body: bytes, headers: dict) -> bool:
 # ---------------------------------------------------------------------------
 
 
-def extract_recording_id(payload: dict) -> str:
+class FathomWebhook(msgspec.Struct):
+    """The subset of the new-meeting-content-ready payload the pipeline reads."""
+    meeting_title: Optional[str] = "Untitled Meeting"
+    created_at:    Optional[str] = ""
+    url:           Optional[str] = ""
+    transcript:    Optional[list] = None   # segments stay plain dicts
+
+
+def extract_recording_id(payload: FathomWebhook) -> str:
     """
     Parse recording_id from the payload's url field.
     URL formats:
@@ -158,85 +153,140 @@ def extract_recording_id(payload: dict) -> str:
       - https://fathom.video/calls/{call_id}
     Fallback: epoch timestamp (unique enough for single-user cadence).
     """
-    url = payload.get("url", "")
+    url = payload.url
     if url:
-        segments = urlparse(url).path.strip("/").split("/")
         # Handle both /recordings/{id} and /calls/{id} formats
-        if len(segments) >= 2 and segments[-2] in ("recordings", "calls") and segments[-1]:
-            print(f"Extracted recording_id: {segments[-1]}")
-            return segments[-1]
+        match = RECORDING_URL_RE.search(url)
+        if match:
+            print(f"Extracted recording_id: {match.group(1)}")
+            return match.group(1)
 
     fallback = str(int(time.time()))
     print(f"WARNING: Could not parse recording_id from url '{url}', using fallback: {fallback}", file=sys.stderr)
     return fallback
 
 
-def normalize_payload(payload: dict) -> tuple:
+def normalize_payload(payload: FathomWebhook) -> tuple:
     """
     Map webhook payload → transcript JSON shape the existing tools consume.
     Returns (normalized_dict, recording_id).
     """
     recording_id = extract_recording_id(payload)
-    transcript   = payload.get("transcript", [])
-
-    # Deduplicate speaker names for the Gemini prompt PARTICIPANTS header
-    seen        = set()
-    participants = []
-    for seg in transcript:
-        speaker = seg.get("speaker", {})
-        name = speaker.get("display_name", "Unknown") if isinstance(speaker, dict) else str(speaker)
-        if name not in seen:
-            seen.add(name)
-            participants.append(name)
 
     normalized = {
-        "title":        payload.get("meeting_title", "Untitled Meeting"),
-        "date":         payload.get("created_at", ""),
-        "participants": participants,
-        "transcript":   transcript,   # verbatim — nested speaker objects intact
+        "title":        payload.meeting_title,
+        "date":         payload.created_at,
+        "transcript":   payload.transcript or [],   # verbatim — nested speaker objects intact
     }
-    return normalized, recording_id
 
+    # Names only: on the 202 path the transcript is shipped to the worker as
+    # JSON, so the full preprocess pass (transcript_utils.get_preprocessed)
+    # is left to whichever process runs the tools.
+    normalized["participants"] = participants(normalized["transcript"])
+    return normalized, recording_id
 
-def check_tools():
-    """Verify tools were imported successfully."""
-    if summarizer is None or logger is None:
-        raise RuntimeError("Tools (summarizer/logger) failed to import. Check requirements.txt and logs.")
 
-def run_pipeline(recording_id: str, transcript_path: str) -> None:
-    """Execute summarize → log_to_airtable via direct function calls."""
-    check_tools()
-    
-    # Switch to /tmp so that tools can write to relative paths (e.g. .tmp/)
+def _persist(transcript_path: Path, data: dict) -> None:
+    """Write data to transcript_path atomically (tmp file + os.replace). Never raises."""
+    tmp_path = transcript_path.with_suffix(".json.tmp")
     try:
-        os.chdir("/tmp")
+        TMP_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(orjson.dumps(data, option=TRANSCRIPT_JSON_OPTION))
+        os.replace(tmp_path, transcript_path)
+        print(f"Saved transcript → {transcript_path}")
     except Exception as e:
-        print(f"WARNING: Failed to chdir to /tmp: {e}", file=sys.stderr)
+        print(f"WARNING: Failed to write transcript: {e}", file=sys.stderr)
 
-    # Fail fast on missing env vars
-    for var in ("GOOGLE_GEMINI_API_KEY", "AIRTABLE_API_KEY", "AIRTABLE_BASE_ID"):
-        if not os.environ.get(var):
-            raise EnvironmentError(f"Required env var {var} is not set")
 
-    transcript_file = Path(transcript_path)
-    summary_path = f"/tmp/.tmp/summary_{recording_id}.json"
-    summary_file = Path(summary_path)
+def persist_transcript(recording_id: str, normalized: dict) -> threading.Thread:
+    """
+    Save the normalized transcript to TMP_DIR for debugging, off the request path.
 
-    # Step 1: Summarize with Gemini (Hebrew summary + action items)
-    print("--- summarize_with_gemini ---")
-    exit_code = summarizer.main(transcript_file=transcript_file)
-    if exit_code != 0:
-        raise RuntimeError(f"Summarization failed with exit code {exit_code}")
+    Serialization and disk I/O run on a daemon thread so they never delay the
+    hand-off or the response. The snapshot (without the preprocessing cache)
+    is taken here, on the request thread. Returns the started thread.
+    """
+    transcript_path = TMP_DIR / f"transcript_{recording_id}.json"
+    thread = threading.Thread(
+        target=_persist,
+        args=(transcript_path, serializable(normalized)),
+        daemon=True,
+    )
+    thread.start()
+    return thread
 
-    # Verify output exists before proceeding
-    if not summary_file.exists():
-        raise FileNotFoundError(f"Summary file not produced at {summary_path}")
 
-    # Step 2: Log meeting + tasks to Airtable
-    print("--- log_to_airtable ---")
-    exit_code = logger.main(summary_file=summary_file, transcript_file=transcript_file)
-    if exit_code != 0:
-        raise RuntimeError(f"Airtable logging failed with exit code {exit_code}")
+# ---------------------------------------------------------------------------
+# PIPELINE HAND-OFF
+# ---------------------------------------------------------------------------
+
+
+def queue_configured() -> bool:
+    """True when the QStash hand-off to api/process.py is fully configured."""
+    return PIPELINE_HMAC is not None and all(
+        os.environ.get(var) for var in ("QSTASH_TOKEN", "PIPELINE_WORKER_URL")
+    )
+
+
+def job_segments(transcript: list) -> list:
+    """
+    Strip transcript segments down to the fields the tools read, keeping
+    the Fathom shape: timestamp, text and speaker.display_name /
+    speaker.matched_calendar_invitee_email.
+    """
+    segments = []
+    for segment in transcript:
+        speaker = segment.get("speaker")
+        if isinstance(speaker, dict):
+            speaker = {
+                "display_name":                   speaker.get("display_name"),
+                "matched_calendar_invitee_email": speaker.get("matched_calendar_invitee_email"),
+            }
+        segments.append({
+            "timestamp": segment.get("timestamp", ""),
+            "speaker":   speaker,
+            "text":      segment.get("text"),
+        })
+    return segments
+
+
+def enqueue_pipeline(recording_id: str, normalized: dict) -> bool:
+    """
+    Publish the pipeline job to QStash for delivery to api/process.py.
+
+    The job is signed with PIPELINE_SECRET; the webhook-* headers are passed
+    via Upstash-Forward-* so QStash hands them to the worker unchanged.
+    Returns False without publishing if the job is over QSTASH_MAX_BODY
+    (QStash would reject it).
+    Raises on any publish failure so the caller can return non-2xx and let
+    Fathom retry.
+    """
+    job = serializable(normalized)
+    job["transcript"] = job_segments(job["transcript"])
+    body = orjson.dumps({"recording_id": recording_id, "transcript": job})
+    if len(body) > QSTASH_MAX_BODY:
+        print(f"ERROR: Job for {recording_id} is {len(body)} bytes, over the QStash limit; not queued", file=sys.stderr)
+        return False
+
+    msg_id        = f"msg_{uuid.uuid4().hex}"
+    msg_timestamp = str(int(time.time()))
+    signature     = compute_signature(PIPELINE_HMAC, msg_id, msg_timestamp, body)
+
+    request = urllib.request.Request(
+        f"{QSTASH_URL}/v2/publish/{os.environ['PIPELINE_WORKER_URL']}",
+        data=body,
+        method="POST",
+        headers={
+            "Authorization":                       f"Bearer {os.environ['QSTASH_TOKEN']}",
+            "Content-Type":                        "application/json",
+            "Upstash-Forward-webhook-id":          msg_id,
+            "Upstash-Forward-webhook-timestamp":   msg_timestamp,
+            "Upstash-Forward-webhook-signature":   f"v1,{signature}",
+        },
+    )
+    with urllib.request.urlopen(request, timeout=QSTASH_TIMEOUT) as response:
+        print(f"Queued pipeline job for {recording_id} (QStash HTTP {response.status})")
+    return True
 
 
 # ---------------------------------------------------------------------------
@@ -271,10 +321,10 @@ class handler(BaseHTTPRequestHandler):
             self._json(401, {"error": "Invalid signature"})
             return
 
-        # --- Parse JSON ---
+        # --- Parse JSON (once, only the fields we use) ---
         try:
-            payload = json.loads(raw_body.decode("utf-8"))
-        except json.JSONDecodeError as e:
+            payload = msgspec.json.decode(raw_body, type=FathomWebhook)
+        except msgspec.DecodeError as e:  # also covers ValidationError
             print(f"ERROR: Malformed JSON: {e}", file=sys.stderr)
             self._json(400, {"error": "Malformed JSON"})
             return
@@ -283,53 +333,42 @@ class handler(BaseHTTPRequestHandler):
         normalized, recording_id = normalize_payload(payload)
         print(f"Processing: title='{normalized['title']}' recording_id='{recording_id}'")
 
-        # --- Ensure /tmp/.tmp/ exists ---
-        TMP_DIR.mkdir(parents=True, exist_ok=True)
-
-        # --- Save normalized transcript to disk ---
-        transcript_path = str(TMP_DIR / f"transcript_{recording_id}.json")
-        try:
-            with open(transcript_path, "w", encoding="utf-8") as f:
-                json.dump(normalized, f, indent=2, ensure_ascii=False)
-            print(f"Saved transcript → {transcript_path}")
-        except Exception as e:
-            print(f"ERROR: Failed to write transcript: {e}", file=sys.stderr)
-            self._json(500, {"error": "Failed to save transcript"})
+        # --- Optionally save normalized transcript to disk (debugging only) ---
+        # The pipeline receives the dict in memory, so nothing downstream
+        # reads this file; it is written in the background.
+        if os.environ.get("DEBUG_PERSIST"):
+            persist_transcript(recording_id, normalized)
+
+        # --- Hand off to the worker and acknowledge right away ---
+        if queue_configured():
+            try:
+                queued = enqueue_pipeline(recording_id, normalized)
+            except Exception as e:
+                print(f"ERROR: Failed to queue pipeline job: {e}", file=sys.stderr)
+                self._json(500, {"error": "Failed to queue pipeline job"})
+                return
+
+            if not queued:
+                # Too large for QStash. Acknowledge with 2xx so Fathom doesn't
+                # retry a job that can never be queued; the error is logged.
+                self._json(200, {
+                    "status":       "skipped",
+                    "error":        "Transcript too large to queue",
+                    "recording_id": recording_id,
+                })
+                return
+
+            self._json(202, {
+                "status":       "accepted",
+                "recording_id": recording_id,
+                "title":        normalized["title"],
+            })
             return
 
-        # --- Run the pipeline (summarize → log) ---
-        try:
-            run_pipeline(recording_id, transcript_path)
-
-        except EnvironmentError as e:
-            print(f"ERROR: {e}", file=sys.stderr)
-            self._json(500, {"error": str(e)})
-            return
-        except FileNotFoundError as e:
-            print(f"ERROR: {e}", file=sys.stderr)
-            self._json(500, {"error": str(e)})
-            return
-        except RuntimeError as e:
-            print(f"ERROR: Pipeline step failed: {e}", file=sys.stderr)
-            self._json(500, {"error": str(e)})
-            return
-        except subprocess.TimeoutExpired:
-            print("ERROR: Subprocess timed out", file=sys.stderr)
-            self._json(504, {"error": "Processing timed out"})
-            return
-        except Exception as e:
-            print(f"ERROR: Unexpected: {e}", file=sys.stderr)
-            import traceback
-            traceback.print_exc()
-            self._json(500, {"error": "Unexpected error"})
-            return
-
-        # --- 200 only on full success (non-2xx triggers Fathom retry) ---
-        self._json(200, {
-            "status":       "ok",
-            "recording_id": recording_id,
-            "title":        normalized["title"],
-        })
+        # --- No queue configured: run the pipeline inline (summarize → log) ---
+        from process import run_job
+        code, body = run_job(recording_id, normalized)
+        self._json(code, body)
 
     # --- helpers ---
 
@@ -337,7 +376,7 @@ class handler(BaseHTTPRequestHandler):
         self.send_response(code)
         self.send_header("Content-Type", "application/json")
         self.end_headers()
-        self.wfile.write(json.dumps(body).encode("utf-8"))
+        self.wfile.write(orjson.dumps(body))
 
     def log_message(self, format, *args):
         # Suppress BaseHTTPRequestHandler's default stderr noise;
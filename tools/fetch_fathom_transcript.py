@@ -21,11 +21,14 @@ Output:
 
 import os
 import sys
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
+from storage import TMP_DIR, TRANSCRIPT_JSON_OPTION
 
 # Load environment variables
 load_dotenv()
@@ -33,7 +36,28 @@ load_dotenv()
 # Constants
 FATHOM_API_BASE = "https://api.fathom.ai/external/v1"
 FATHOM_API_KEY = os.getenv("FATHOM_API_KEY")
-OUTPUT_DIR = Path(".tmp")
+OUTPUT_DIR = TMP_DIR
+
+# Shared session: reuses the TCP+TLS connection across calls (e.g. backfills).
+# Transient failures (429/5xx) are retried with backoff before we see them;
+# raise_on_status=False hands the final response to fetch_transcript's
+# status handling instead of raising RetryError. requests already sends
+# Accept-Encoding: gzip, deflate, so transcripts transfer compressed.
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "X-Api-Key": FATHOM_API_KEY,
+    "Accept": "application/json"
+})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+))
 
 
 class FathomAPIError(Exception):
@@ -65,18 +89,13 @@ def fetch_transcript(recording_id: str) -> Dict[str, Any]:
     """
     url = f"{FATHOM_API_BASE}/recordings/{recording_id}/transcript"
 
-    headers = {
-        "X-Api-Key": FATHOM_API_KEY,
-        "Accept": "application/json"
-    }
-
     try:
         print(f"Fetching transcript for recording: {recording_id}")
-        response = requests.get(url, headers=headers, timeout=30)
+        response = _SESSION.get(url, timeout=30)
 
         # Handle different response codes
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"✓ Successfully fetched transcript ({len(data.get('transcript', []))} segments)")
             return data
 
@@ -106,7 +125,7 @@ def fetch_transcript(recording_id: str) -> Dict[str, Any]:
     except requests.exceptions.ConnectionError:
         raise FathomAPIError("Connection error. Please check your internet connection.")
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         raise FathomAPIError("Invalid JSON response from API")
 
 
@@ -122,14 +141,13 @@ def save_transcript(recording_id: str, data: Dict[str, Any]) -> Path:
         Path to the saved file
     """
     # Ensure output directory exists
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     # Create output file path
     output_file = OUTPUT_DIR / f"transcript_{recording_id}.json"
 
     # Write data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    output_file.write_bytes(orjson.dumps(data, option=TRANSCRIPT_JSON_OPTION))
 
     print(f"✓ Transcript saved to: {output_file}")
     return output_file
@@ -155,16 +173,16 @@ def get_recording_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def main():
+def main(recording_id: Optional[str] = None):
     """Main execution function."""
-    # Check for recording ID argument
-    if len(sys.argv) != 2:
-        print("Usage: python fetch_fathom_transcript.py <recording_id>")
-        print("\nExample:")
-        print("  python fetch_fathom_transcript.py abc123def456")
-        sys.exit(1)
-
-    recording_id = sys.argv[1]
+    # Check for recording ID argument if not provided
+    if recording_id is None:
+        if len(sys.argv) != 2:
+            print("Usage: python fetch_fathom_transcript.py <recording_id>")
+            print("\nExample:")
+            print("  python fetch_fathom_transcript.py abc123def456")
+            sys.exit(1)
+        recording_id = sys.argv[1]
 
     try:
         # Validate environment
@@ -10,16 +10,18 @@ This tool handles the complete Airtable logging workflow:
 Uses pyairtable for deterministic API operations.
 
 Usage:
-    python log_to_airtable.py <summary_file>
+    python log_to_airtable.py <summary_file> <transcript_file>
 
 Example:
-    python log_to_airtable.py .tmp/summary_abc123.json
+    python log_to_airtable.py .tmp/summary_abc123.json .tmp/transcript_abc123.json
 
 Environment Variables:
     AIRTABLE_API_KEY: Your Airtable Personal Access Token (required)
     AIRTABLE_BASE_ID: Your Airtable base ID (required)
     AIRTABLE_MEETINGS_TABLE: Name of Meetings table (default: "Meetings")
     AIRTABLE_TASKS_TABLE: Name of Tasks table (default: "Tasks")
+    AIRTABLE_LINK_TASKS: Set to 1 to also write task links onto the meeting's
+        "Tasks" field (only needed without automatic two-way linking)
 
 Output:
     Creates records in Airtable and returns record IDs
@@ -27,12 +29,17 @@ Output:
 
 import os
 import sys
-import json
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
-from pyairtable import Api
 from dotenv import load_dotenv
+from storage import load_json
+from transcript_utils import get_preprocessed
 
 # Load environment variables
 load_dotenv()
@@ -42,6 +49,35 @@ AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
 AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
 AIRTABLE_MEETINGS_TABLE = os.getenv("AIRTABLE_MEETINGS_TABLE", "Meetings")
 AIRTABLE_TASKS_TABLE = os.getenv("AIRTABLE_TASKS_TABLE", "Tasks")
+AIRTABLE_LINK_TASKS = os.getenv("AIRTABLE_LINK_TASKS", "").lower() in ("1", "true", "yes")
+
+# Airtable allows 5 requests/sec per base; never have more in flight than that
+AIRTABLE_MAX_CONCURRENCY = 5
+
+AIRTABLE_API_URL = "https://api.airtable.com"
+
+# Retry policy for every Airtable request (create, batch_create, update).
+# The rate limiter below keeps normal traffic under the cap; this handles
+# the 429s that still get through.
+# A 429 means "wait 30 seconds"; six retries with exponential backoff
+# (0.5s, 1s, 2s ... 16s, ~31s in total) ride that out instead of dropping
+# the write. Jitter keeps concurrent batch writers from retrying in lockstep,
+# and urllib3 sleeps for Retry-After instead when the response sends one.
+# (Arguments to pyairtable.retry_strategy, applied in _tables.)
+AIRTABLE_RETRY = dict(
+    status_forcelist=(429,),
+    total=6,
+    backoff_factor=0.5,
+    backoff_jitter=0.5,
+    respect_retry_after_header=True,
+)
+
+# Airtable accepts at most 10 records per create request
+AIRTABLE_BATCH_SIZE = 10
+
+# Client-side pacing, just under Airtable's 5 requests/sec per base
+AIRTABLE_RATE = 4.5   # tokens per second
+AIRTABLE_BURST = 5
 
 
 class AirtableError(Exception):
@@ -82,18 +118,40 @@ def load_summary(file_path: Path) -> dict:
 
     Raises:
         FileNotFoundError: If the file doesn't exist
-        json.JSONDecodeError: If the file isn't valid JSON
+        orjson.JSONDecodeError: If the file isn't valid JSON
     """
     if not file_path.exists():
         raise FileNotFoundError(f"Summary file not found: {file_path}")
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(file_path)
 
     print(f"✓ Loaded summary from {file_path}")
     return data
 
 
+def load_transcript(file_path: Path) -> dict:
+    """
+    Load transcript JSON file.
+
+    Args:
+        file_path: Path to the transcript JSON file
+
+    Returns:
+        Dict containing the transcript data
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        orjson.JSONDecodeError: If the file isn't valid JSON
+    """
+    if not file_path.exists():
+        raise FileNotFoundError(f"Transcript file not found: {file_path}")
+
+    data = load_json(file_path)
+
+    print(f"✓ Loaded transcript from {file_path}")
+    return data
+
+
 # ============================================================================
 # HELPER FUNCTIONS (Production-Hardened)
 # ============================================================================
@@ -107,6 +165,7 @@ def format_attendees(transcript_data: dict) -> str:
         transcript[].speaker.matched_calendar_invitee_email  (nullable)
 
     Deduplicates by display_name, preferring email when available.
+    Computed in the shared single pass (transcript_utils.preprocess).
 
     Args:
         transcript_data: The transcript data from Fathom
@@ -114,27 +173,13 @@ def format_attendees(transcript_data: dict) -> str:
     Returns:
         Comma-separated string of attendee emails/names
     """
-    seen = {}  # display_name -> email or name
-    for segment in transcript_data.get("transcript", []):
-        speaker = segment.get("speaker", {})
-        if isinstance(speaker, dict):
-            name = speaker.get("display_name", "Unknown")
-            email = speaker.get("matched_calendar_invitee_email")
-        else:
-            name = str(speaker)
-            email = None
-            
-        # Keep the email if we find one; don't downgrade to name if already set
-        if name not in seen or email:
-            seen[name] = email or name
-
-    attendees = list(seen.values())
-    return ", ".join(attendees) if attendees else "No attendees"
+    return get_preprocessed(transcript_data).attendees
 
 
 def format_plain_transcript(transcript_data: dict) -> str:
     """
     Format transcript as plain text without timestamps.
+    Computed in the shared single pass (transcript_utils.preprocess).
 
     Args:
         transcript_data: The transcript data from Fathom
@@ -142,15 +187,7 @@ def format_plain_transcript(transcript_data: dict) -> str:
     Returns:
         Plain text transcript with speaker labels
     """
-    transcript = transcript_data.get("transcript", [])
-    lines = []
-    for segment in transcript:
-        speaker_obj = segment.get("speaker", {})
-        speaker = speaker_obj.get("display_name", "Unknown") if isinstance(speaker_obj, dict) else str(speaker_obj)
-        text = segment.get("text", "")
-        lines.append(f"{speaker}: {text}")
-
-    return "\n\n".join(lines)
+    return get_preprocessed(transcript_data).plain_text
 
 
 def format_hebrew_summary(summary: dict) -> str:
@@ -164,38 +201,60 @@ def format_hebrew_summary(summary: dict) -> str:
     Returns:
         Formatted Hebrew summary with proper RTL handling
     """
-    sections = []
-
     # Meeting Purpose
-    sections.append(f"**תכלית הפגישה:** {summary.get('meeting_purpose', '')}")
+    sections = [f"**תכלית הפגישה:** {summary.get('meeting_purpose', '')}"]
 
     # Key Takeaways
-    if summary.get('key_takeaways'):
+    takeaways = summary.get('key_takeaways')
+    if takeaways:
         sections.append("\n**מסקנות עיקריות:**")
-        for item in summary['key_takeaways']:
-            sections.append(f"• {item}")
+        sections.extend(f"• {item}" for item in takeaways)
 
     # Topics
-    if summary.get('topics'):
+    topics = summary.get('topics')
+    if topics:
         sections.append("\n**נושאים:**")
-        for topic in summary['topics']:
-            sections.append(f"\n**{topic['title']}**\n{topic['description']}")
+        sections.extend(f"\n**{topic['title']}**\n{topic['description']}" for topic in topics)
 
     # Action Items
-    if summary.get('action_items'):
+    action_items = summary.get('action_items')
+    if action_items:
         sections.append("\n**פעולות:**")
-        for task in summary['action_items']:
-            # RTL Fix: Put English characters on their own line to prevent garbling
-            task_line = f"• {task['title']}"
-            if task.get('owner'):
-                task_line += f"\n  אחראי: {task['owner']}"  # "Responsible:" in Hebrew
-            if task.get('due_date'):
-                task_line += f"\n  מועד: {task['due_date']}"  # "Deadline:" in Hebrew
-            sections.append(task_line)
+        for task in action_items:
+            # RTL Fix: Put English characters on their own line to prevent garbling.
+            # Each detail is its own entry; the final "\n".join puts them on separate lines.
+            sections.append(f"• {task['title']}")
+            owner = task.get('owner')
+            if owner:
+                sections.append(f"  אחראי: {owner}")  # "Responsible:" in Hebrew
+            due_date = task.get('due_date')
+            if due_date:
+                sections.append(f"  מועד: {due_date}")  # "Deadline:" in Hebrew
 
     return "\n".join(sections)
 
 
+# Gemini priority -> Airtable P-format
+_PRIORITY = {
+    "High": "P1",
+    "Medium": "P2",
+    "Low": "P3"
+}
+
+# Exact options of the Status single-select field in Airtable
+_STATUS_VALID = frozenset({"To-Do", "In Progress", "Done"})
+
+# Common variations, keyed by their lowercased form
+_STATUS_FALLBACK = {
+    "to do": "To-Do",
+    "todo": "To-Do",
+    "in progress": "In Progress",
+    "inprogress": "In Progress",
+    "done": "Done",
+    "completed": "Done"
+}
+
+
 def map_priority_to_p_format(priority: str) -> str:
     """
     Map High/Medium/Low to P1/P2/P3 format.
@@ -206,12 +265,7 @@ def map_priority_to_p_format(priority: str) -> str:
     Returns:
         P1, P2, or P3
     """
-    mapping = {
-        "High": "P1",
-        "Medium": "P2",
-        "Low": "P3"
-    }
-    return mapping.get(priority.strip(), "P2")  # Strip whitespace for safety
+    return _PRIORITY.get(priority.strip(), "P2")  # Strip whitespace for safety
 
 
 def normalize_status(status: str) -> str:
@@ -225,36 +279,135 @@ def normalize_status(status: str) -> str:
     Returns:
         Valid Airtable status: "To-Do", "In Progress", or "Done"
     """
-    # Strip whitespace and normalize to exact Airtable options
     normalized = status.strip()
+    if normalized in _STATUS_VALID:
+        return normalized
+    return _STATUS_FALLBACK.get(normalized.lower(), "To-Do")
 
-    # Valid statuses in user's Airtable
-    valid_statuses = ["To-Do", "In Progress", "Done"]
 
-    if normalized in valid_statuses:
-        return normalized
+# Status for every newly created task (constant; computed once)
+_TODO_STATUS = normalize_status("To-Do")
 
-    # Fallback mapping for common variations
-    fallback_mapping = {
-        "to do": "To-Do",
-        "todo": "To-Do",
-        "To Do": "To-Do",
-        "in progress": "In Progress",
-        "inprogress": "In Progress",
-        "done": "Done",
-        "completed": "Done"
-    }
 
-    return fallback_mapping.get(normalized.lower(), "To-Do")
+# ============================================================================
+# RATE LIMITING
+# ============================================================================
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    acquire() takes one token, sleeping until one is available. Callers
+    reserve their token under the lock (the count may go negative) and sleep
+    outside it, so concurrent writers are spaced out in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= 1
+            wait = max(0.0, -self.tokens / self.rate)
+
+        if wait:
+            time.sleep(wait)
+
+
+# One bucket per Airtable base (the unit Airtable rate-limits), shared by
+# every table and thread in the process
+_RATE_LIMITERS: Dict[str, RateLimiter] = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def rate_limiter(base_id: str) -> RateLimiter:
+    """Return the process-wide RateLimiter for an Airtable base."""
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(base_id)
+        if limiter is None:
+            limiter = _RATE_LIMITERS[base_id] = RateLimiter(AIRTABLE_RATE, AIRTABLE_BURST)
+        return limiter
 
 
 # ============================================================================
 # AIRTABLE OPERATIONS
 # ============================================================================
 
+@functools.lru_cache(maxsize=1)
+def _tables() -> tuple:
+    """
+    Build the Api client and table objects once per process.
+
+    The Api owns a requests.Session, so reusing it keeps the TCP+TLS
+    connection to api.airtable.com alive across pipeline runs on a warm
+    serverless instance instead of handshaking on every invocation. Both
+    tables go through that one session (table.api is the same object).
+
+    The session's adapter for api.airtable.com gets a pool sized for our
+    concurrent writes, so parallel batch_create calls each keep their own
+    connection instead of opening and discarding extras.
+
+    pyairtable (and requests under it) is imported here rather than at
+    module top, so usage and environment errors return without loading it.
+    """
+    from pyairtable import Api, retry_strategy
+    from requests.adapters import HTTPAdapter
+
+    api = Api(AIRTABLE_API_KEY, retry_strategy=retry_strategy(**AIRTABLE_RETRY))
+
+    session = api.session
+    session.headers["Connection"] = "keep-alive"
+    session.mount(AIRTABLE_API_URL, HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=AIRTABLE_MAX_CONCURRENCY,
+        # Keep pyairtable's retry strategy from the adapter we shadow
+        max_retries=session.get_adapter(AIRTABLE_API_URL).max_retries,
+    ))
+
+    base = api.base(AIRTABLE_BASE_ID)
+    return base.table(AIRTABLE_MEETINGS_TABLE), base.table(AIRTABLE_TASKS_TABLE)
+
+
+# Field names per (base_id, table_name), fetched at most once per process.
+# None means the schema could not be read (e.g. the token lacks the
+# schema.bases:read scope); callers then just attempt the write.
+_SCHEMA_CACHE: Dict[tuple, Optional[frozenset]] = {}
+
+
+def get_field_names(table, refresh: bool = False) -> Optional[frozenset]:
+    """
+    Return the table's field names from its schema, cached per process.
+
+    Args:
+        table: An Airtable table object
+        refresh: Re-fetch the schema instead of using the cached copy
+
+    Returns:
+        Frozenset of field names, or None if the schema isn't readable
+    """
+    key = (table.base.id, table.name)
+    if refresh or key not in _SCHEMA_CACHE:
+        try:
+            rate_limiter(table.base.id).acquire()
+            schema = table.schema(force=refresh)
+            _SCHEMA_CACHE[key] = frozenset(field.name for field in schema.fields)
+        except Exception as e:
+            print(f"Note: Could not read schema for table '{table.name}': {e}")
+            _SCHEMA_CACHE[key] = None
+    return _SCHEMA_CACHE[key]
+
+
 def initialize_airtable() -> tuple:
     """
     Initialize Airtable API connection and return table objects.
+    The objects are cached for the life of the process (see _tables).
 
     Returns:
         Tuple of (meetings_table, tasks_table)
@@ -263,9 +416,7 @@ def initialize_airtable() -> tuple:
         AirtableError: If connection fails
     """
     try:
-        api = Api(AIRTABLE_API_KEY)
-        meetings_table = api.table(AIRTABLE_BASE_ID, AIRTABLE_MEETINGS_TABLE)
-        tasks_table = api.table(AIRTABLE_BASE_ID, AIRTABLE_TASKS_TABLE)
+        meetings_table, tasks_table = _tables()
 
         print(f"✓ Connected to Airtable base: {AIRTABLE_BASE_ID}")
         return meetings_table, tasks_table
@@ -308,7 +459,8 @@ def create_meeting_record(
 
     try:
         print(f"Creating meeting record: {fields['Call Name']}")
-        record = meetings_table.create(fields)
+        rate_limiter(AIRTABLE_BASE_ID).acquire()
+        record = meetings_table.create(fields, typecast=True)
         meeting_record_id = record['id']
         print(f"✓ Meeting record created: {meeting_record_id}")
         return meeting_record_id
@@ -317,12 +469,77 @@ def create_meeting_record(
         raise AirtableError(f"Failed to create meeting record: {e}")
 
 
+def _task_fields(task: dict, meeting_record_id: str) -> dict:
+    """Map one action item to the user's Tasks table field structure."""
+    fields = {
+        "Task Description": task.get("title", "משימה ללא כותרת"),  # Hebrew: "Task without title"
+        # Inlined map_priority_to_p_format: one dict lookup per task
+        "Priority": _PRIORITY.get(task.get("priority", "Medium").strip(), "P2"),
+        "Status": _TODO_STATUS,
+        "Source Meeting": [meeting_record_id],  # Link to parent meeting
+    }
+
+    # Add due date if present
+    if task.get("due_date"):
+        fields["Due Date"] = task["due_date"]
+
+    return fields
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most size items."""
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _create_batch(tasks_table, batch: List[dict]) -> List[tuple]:
+    """
+    Create one batch of task records with a single batch_create request.
+
+    If Airtable rejects the batch as invalid (422: one bad record rejects
+    the whole batch), fall back to creating its records one at a time so
+    the rest still land. Any other failure (rate limit after the retry
+    window, auth, timeout, 5xx) is reported against every task in the
+    batch: retrying record by record would only repeat it, and after a
+    timeout or 5xx the batch may already have been created.
+
+    Args:
+        tasks_table: The Airtable Tasks table object
+        batch: Up to AIRTABLE_BATCH_SIZE field dicts
+
+    Returns:
+        One (record_id, None) or (None, exception) tuple per input, in order
+    """
+    limiter = rate_limiter(AIRTABLE_BASE_ID)
+    try:
+        limiter.acquire()
+        return [(record['id'], None) for record in tasks_table.batch_create(batch, typecast=True)]
+    except Exception as e:
+        from requests import HTTPError
+
+        response = e.response if isinstance(e, HTTPError) else None
+        if response is None or response.status_code != 422:
+            print(f"✗ Batch of {len(batch)} tasks failed: {e}")
+            return [(None, e)] * len(batch)
+        print(f"✗ Batch of {len(batch)} tasks rejected, creating them one at a time: {e}")
+
+    results = []
+    for fields in batch:
+        try:
+            limiter.acquire()
+            results.append((tasks_table.create(fields, typecast=True)['id'], None))
+        except Exception as e:
+            results.append((None, e))
+    return results
+
+
 def create_task_records(
     tasks_table,
     action_items: List[dict],
     meeting_record_id: str,
     meeting_title: str
-) -> List[str]:
+) -> Tuple[List[str], List[dict]]:
     """
     Create task records in the Tasks table and link them to the meeting.
 
@@ -333,45 +550,48 @@ def create_task_records(
         meeting_title: The meeting title for reference
 
     Returns:
-        List of created task record IDs
+        Tuple of (created task record IDs, the action items they were
+        created from), parallel lists; failed tasks appear in neither
 
     Raises:
         AirtableError: If task creation fails
     """
     if not action_items:
         print("No action items to create")
-        return []
-
-    task_record_ids = []
+        return [], []
 
     print(f"\nCreating {len(action_items)} task records...")
 
-    for i, task in enumerate(action_items, 1):
-        # Map to user's Airtable field structure
-        fields = {
-            "Task Description": task.get("title", "משימה ללא כותרת"),  # Hebrew: "Task without title"
-            "Priority": map_priority_to_p_format(task.get("priority", "Medium")),
-            "Status": normalize_status("To-Do"),
-            "Source Meeting": [meeting_record_id],  # Link to parent meeting
-        }
+    all_fields = [_task_fields(task, meeting_record_id) for task in action_items]
+    batches = list(_chunked(all_fields, AIRTABLE_BATCH_SIZE))
 
-        # Add due date if present
-        if task.get("due_date"):
-            fields["Due Date"] = task["due_date"]
-
-        try:
-            record = tasks_table.create(fields)
-            task_record_id = record['id']
-            task_record_ids.append(task_record_id)
-            print(f"  {i}. ✓ Created task: {fields['Task Description']} [{task_record_id}]")
-
-        except Exception as e:
-            print(f"  {i}. ✗ Failed to create task '{fields['Task Description']}': {e}")
-            # Continue with other tasks even if one fails
-            continue
-
-    print(f"✓ Created {len(task_record_ids)}/{len(action_items)} task records")
-    return task_record_ids
+    # Batches are independent of each other, so post them concurrently; a
+    # typical meeting fits in a single request. Results come back in input order.
+    task_record_ids = []
+    created_items = []
+    workers = min(AIRTABLE_MAX_CONCURRENCY, len(batches))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_create_batch, tasks_table, batch) for batch in batches]
+
+        # Collect the per-task report and write it with a single print():
+        # one stdout write/flush instead of one per task, and the report
+        # stays in one piece when several pipelines share stdout.
+        report = []
+        i = 0
+        for batch, future in zip(batches, futures):
+            for fields, (task_record_id, error) in zip(batch, future.result()):
+                i += 1
+                if error is not None:
+                    # Continue with other tasks even if one fails
+                    report.append(f"  {i}. ✗ Failed to create task '{fields['Task Description']}': {error}")
+                    continue
+                task_record_ids.append(task_record_id)
+                created_items.append(action_items[i - 1])
+                report.append(f"  {i}. ✓ Created task: {fields['Task Description']} [{task_record_id}]")
+
+    report.append(f"✓ Created {len(task_record_ids)}/{len(action_items)} task records")
+    print("\n".join(report))
+    return task_record_ids, created_items
 
 
 def update_meeting_with_tasks(
@@ -393,11 +613,17 @@ def update_meeting_with_tasks(
     if not task_record_ids:
         return
 
+    # Only update if you have a "Tasks" linked field in the Meetings table
+    field_names = get_field_names(meetings_table)
+    if field_names is not None and "Tasks" not in field_names:
+        print("Note: Meetings table has no 'Tasks' field; skipping meeting->tasks link")
+        return
+
     try:
-        # Only update if you have a "Tasks" linked field in the Meetings table
+        rate_limiter(AIRTABLE_BASE_ID).acquire()
         meetings_table.update(meeting_record_id, {
             "Tasks": task_record_ids
-        })
+        }, typecast=True)
         print(f"✓ Linked {len(task_record_ids)} tasks to meeting record")
 
     except Exception as e:
@@ -412,25 +638,85 @@ def update_meeting_with_tasks(
 def display_results(
     meeting_record_id: str,
     task_record_ids: List[str],
-    summary: dict
+    summary: dict,
+    created_items: List[dict]
 ) -> None:
-    """Display a summary of what was created in Airtable."""
-    print("\n" + "="*80)
-    print("AIRTABLE LOGGING COMPLETE")
-    print("="*80)
-    print(f"\nMeeting: {summary.get('meeting_title', 'Untitled')}")
-    print(f"  Record ID: {meeting_record_id}")
-    print(f"  Sentiment: {summary.get('meeting_sentiment', 'N/A')}")
-    print(f"  Key Points: {len(summary.get('key_points', []))}")
-    print(f"  Decisions: {len(summary.get('decisions_made', []))}")
+    """
+    Display a summary of what was created in Airtable.
 
-    print(f"\nTasks Created: {len(task_record_ids)}")
-    if task_record_ids:
-        for i, task_id in enumerate(task_record_ids, 1):
-            task = summary['action_items'][i-1]
-            print(f"  {i}. {task['title']} [{task['priority']}] - {task_id}")
+    created_items is parallel to task_record_ids (see create_task_records),
+    so tasks that failed to create don't shift the pairing.
+    """
+    # Built as one block and written with a single print() (see create_task_records)
+    lines = [
+        "\n" + "="*80,
+        "AIRTABLE LOGGING COMPLETE",
+        "="*80,
+        f"\nMeeting: {summary.get('meeting_title', 'Untitled')}",
+        f"  Record ID: {meeting_record_id}",
+        f"  Sentiment: {summary.get('meeting_sentiment', 'N/A')}",
+        f"  Key Points: {len(summary.get('key_points', []))}",
+        f"  Decisions: {len(summary.get('decisions_made', []))}",
+        f"\nTasks Created: {len(task_record_ids)}",
+    ]
+    for i, (task, task_id) in enumerate(zip(created_items, task_record_ids), 1):
+        lines.append(f"  {i}. {task['title']} [{task['priority']}] - {task_id}")
+
+    lines.append("\n" + "="*80)
+    print("\n".join(lines))
+
+
+def run(summary: dict, transcript_data: dict, recording_id: str) -> tuple:
+    """
+    In-process entry point used by the webhook and the orchestrator.
+
+    Takes the summary and transcript dicts directly (no file round trip).
+    Errors propagate to the caller instead of being mapped to exit codes.
 
-    print("\n" + "="*80)
+    Args:
+        summary: The meeting summary dict (summarize_with_gemini.run output)
+        transcript_data: The transcript data (Fathom shape)
+        recording_id: The Fathom recording ID
+
+    Returns:
+        Tuple of (meeting_record_id, task_record_ids)
+    """
+    # Validate environment
+    validate_environment()
+
+    # Initialize Airtable
+    meetings_table, tasks_table = initialize_airtable()
+
+    # Create meeting record (now with transcript data)
+    meeting_record_id = create_meeting_record(
+        meetings_table,
+        summary,
+        transcript_data,
+        recording_id
+    )
+
+    # Create task records
+    task_record_ids, created_items = create_task_records(
+        tasks_table,
+        summary.get('action_items', []),
+        meeting_record_id,
+        summary.get('meeting_title', 'Untitled Meeting')
+    )
+
+    # Optional: Update meeting with task links (if bidirectional linking not automatic).
+    # The update doesn't affect what display_results prints, so overlap its
+    # round trip with the display instead of waiting for it first.
+    if AIRTABLE_LINK_TASKS:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            link_future = executor.submit(
+                update_meeting_with_tasks, meetings_table, meeting_record_id, task_record_ids
+            )
+            display_results(meeting_record_id, task_record_ids, summary, created_items)
+            link_future.result()  # never raises; bounded by AIRTABLE_RETRY
+    else:
+        display_results(meeting_record_id, task_record_ids, summary, created_items)
+
+    return meeting_record_id, task_record_ids
 
 
 def main(summary_file: Optional[Path] = None, transcript_file: Optional[Path] = None):
@@ -446,40 +732,14 @@ def main(summary_file: Optional[Path] = None, transcript_file: Optional[Path] =
         transcript_file = Path(sys.argv[2])
 
     try:
-        # Validate environment
-        validate_environment()
-
         # Load summary and transcript
         summary = load_summary(summary_file)
-        transcript_data = load_summary(transcript_file)  # Reuse load_summary for consistency
+        transcript_data = load_transcript(transcript_file)
 
         # Extract recording ID from filename
         recording_id = summary_file.stem.replace("summary_", "")
 
-        # Initialize Airtable
-        meetings_table, tasks_table = initialize_airtable()
-
-        # Create meeting record (now with transcript data)
-        meeting_record_id = create_meeting_record(
-            meetings_table,
-            summary,
-            transcript_data,
-            recording_id
-        )
-
-        # Create task records
-        task_record_ids = create_task_records(
-            tasks_table,
-            summary.get('action_items', []),
-            meeting_record_id,
-            summary.get('meeting_title', 'Untitled Meeting')
-        )
-
-        # Optional: Update meeting with task links (if bidirectional linking not automatic)
-        # update_meeting_with_tasks(meetings_table, meeting_record_id, task_record_ids)
-
-        # Display results
-        display_results(meeting_record_id, task_record_ids, summary)
+        meeting_record_id, task_record_ids = run(summary, transcript_data, recording_id)
 
         # Success
         print(f"\n✓ SUCCESS: Data logged to Airtable")
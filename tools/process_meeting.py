@@ -7,25 +7,45 @@ Runs the complete WAT pipeline:
 2. Summarize with Gemini
 3. Log to Airtable
 
+The three tools are imported and their main() functions called in-process,
+so the interpreter starts and the heavy SDKs (google-generativeai,
+pyairtable, pydantic) are imported once rather than once per step.
+
 Usage:
-    python process_meeting.py <recording_id>
+    python process_meeting.py <recording_id> [<recording_id> ...]
 
 Example:
     python process_meeting.py abc123def456
+    python process_meeting.py abc123def456 ghi789jkl012   # processed in parallel
 
 Options:
     --keep-files    Keep intermediate JSON files after completion
     --skip-airtable Skip Airtable logging (useful for testing)
+    --force-summarize
+                    Re-fetch and re-summarize even if a summary from a
+                    previous run is still in .tmp/
 
 Environment Variables:
     See .env.example for all required API keys
 """
 
 import sys
-import subprocess
 import argparse
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+from typing import Callable
+from storage import TMP_DIR
+
+import fetch_fathom_transcript
+import summarize_with_gemini
+import log_to_airtable
+
+
+# Recordings are independent and each pipeline is I/O-bound (Fathom, Gemini,
+# Airtable), so several run side by side. Kept small: every pipeline writes
+# to the same Airtable base.
+MAX_PARALLEL_RECORDINGS = 3
 
 
 class ProcessingError(Exception):
@@ -46,31 +66,29 @@ def print_step(step_num: int, total: int, description: str) -> None:
     print("-" * 60)
 
 
-def run_tool(script_name: str, args: list) -> int:
+def run_tool(tool_main: Callable[..., int], *args) -> int:
     """
-    Run a tool script and return the exit code.
+    Run a tool's main() in-process and return the exit code.
 
     Args:
-        script_name: Name of the Python script to run
-        args: List of arguments to pass to the script
+        tool_main: The tool module's main function
+        *args: Arguments to pass to it (instead of command-line arguments)
 
     Returns:
-        Exit code from the script
+        Exit code from the tool
 
     Raises:
-        ProcessingError: If the script fails
+        ProcessingError: If the tool fails
     """
-    script_path = Path(__file__).parent / script_name
-    cmd = ["python3", str(script_path)] + args
-
-    print(f"Running: {' '.join(cmd)}\n")
+    tool_name = f"{tool_main.__module__}.py"
+    print(f"Running: {tool_name} {' '.join(str(a) for a in args)}\n")
 
-    result = subprocess.run(cmd, capture_output=False)
+    returncode = tool_main(*args)
 
-    if result.returncode != 0:
-        raise ProcessingError(f"{script_name} failed with exit code {result.returncode}")
+    if returncode != 0:
+        raise ProcessingError(f"{tool_name} failed with exit code {returncode}")
 
-    return result.returncode
+    return returncode
 
 
 def cleanup_files(recording_id: str) -> None:
@@ -80,8 +98,8 @@ def cleanup_files(recording_id: str) -> None:
     Args:
         recording_id: The recording ID
     """
-    transcript_file = Path(".tmp") / f"transcript_{recording_id}.json"
-    summary_file = Path(".tmp") / f"summary_{recording_id}.json"
+    transcript_file = TMP_DIR / f"transcript_{recording_id}.json"
+    summary_file = TMP_DIR / f"summary_{recording_id}.json"
 
     files_removed = []
 
@@ -99,6 +117,134 @@ def cleanup_files(recording_id: str) -> None:
             print(f"  - {file}")
 
 
+def has_cached_summary(transcript_file: Path, summary_file: Path) -> bool:
+    """
+    True if a previous run left a summary that was generated from the
+    transcript currently on disk (summary newer than transcript).
+
+    Files survive a run with --keep-files, or a run that failed after
+    summarizing (e.g. while debugging the Airtable step).
+    """
+    try:
+        return summary_file.stat().st_mtime > transcript_file.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+
+def process_recording(
+    recording_id: str,
+    keep_files: bool,
+    skip_airtable: bool,
+    force_summarize: bool = False
+) -> None:
+    """
+    Run fetch → summarize → log for one recording.
+
+    Args:
+        recording_id: The Fathom recording ID
+        keep_files: Keep the intermediate JSON files
+        skip_airtable: Stop after the summary
+        force_summarize: Ignore a cached summary from a previous run
+
+    Raises:
+        ProcessingError: If any step fails
+    """
+    start_time = datetime.now()
+
+    transcript_file = TMP_DIR / f"transcript_{recording_id}.json"
+    summary_file = TMP_DIR / f"summary_{recording_id}.json"
+
+    # Re-fetching would make the transcript newer than the summary, so a
+    # cache hit skips both steps 1 and 2 (the Gemini call is the slow one)
+    if not force_summarize and has_cached_summary(transcript_file, summary_file):
+        print_step(1, 3, "Skipping fetch (cached summary found)")
+        print_step(2, 3, "Using cached summary (--force-summarize to regenerate)")
+        print(f"Summary: {summary_file}")
+
+    else:
+        # =================================================================
+        # STEP 1: Fetch Transcript
+        # =================================================================
+        print_step(1, 3, "Fetching transcript from Fathom")
+
+        run_tool(fetch_fathom_transcript.main, recording_id)
+
+        if not transcript_file.exists():
+            raise ProcessingError("Transcript file was not created")
+
+        # =================================================================
+        # STEP 2: Generate Summary
+        # =================================================================
+        print_step(2, 3, "Generating AI summary with Gemini")
+
+        run_tool(summarize_with_gemini.main, transcript_file)
+
+        if not summary_file.exists():
+            raise ProcessingError("Summary file was not created")
+
+    # =====================================================================
+    # STEP 3: Log to Airtable
+    # =====================================================================
+    if not skip_airtable:
+        print_step(3, 3, "Logging to Airtable")
+
+        run_tool(log_to_airtable.main, summary_file, transcript_file)
+    else:
+        print_step(3, 3, "Skipping Airtable (--skip-airtable flag set)")
+        print(f"Summary available at: {summary_file}")
+
+    # =====================================================================
+    # CLEANUP
+    # =====================================================================
+    if not keep_files:
+        cleanup_files(recording_id)
+    else:
+        print("\n✓ Keeping intermediate files (--keep-files flag set)")
+        print(f"  - {transcript_file}")
+        print(f"  - {summary_file}")
+
+    # =====================================================================
+    # SUCCESS
+    # =====================================================================
+    duration = (datetime.now() - start_time).total_seconds()
+
+    print_header("PIPELINE COMPLETE")
+    print(f"✓ Recording {recording_id} processed successfully")
+    print(f"✓ Total duration: {duration:.1f} seconds")
+
+    if not skip_airtable:
+        print("\n✓ Meeting and tasks logged to Airtable")
+        print("  Check your Airtable base for the new records")
+    else:
+        print(f"\n✓ Summary saved to: {summary_file}")
+        print("  Run log_to_airtable.py manually when ready")
+
+    print("\n" + "="*80)
+
+
+def try_process_recording(
+    recording_id: str,
+    keep_files: bool,
+    skip_airtable: bool,
+    force_summarize: bool = False
+) -> bool:
+    """Run process_recording() and report failures. Returns True on success."""
+    try:
+        process_recording(recording_id, keep_files, skip_airtable, force_summarize)
+        return True
+
+    except ProcessingError as e:
+        print(f"\n✗ PIPELINE FAILED [{recording_id}]: {e}", file=sys.stderr)
+        print(f"\nPartial results may be available in {TMP_DIR}/", file=sys.stderr)
+        return False
+
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR [{recording_id}]: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main():
     """Main execution function."""
     # Parse arguments
@@ -106,8 +252,10 @@ def main():
         description="Process Fathom meeting: fetch, summarize, and log to Airtable"
     )
     parser.add_argument(
-        "recording_id",
-        help="Fathom recording ID"
+        "recording_ids",
+        nargs="+",
+        metavar="recording_id",
+        help="Fathom recording ID (several may be given)"
     )
     parser.add_argument(
         "--keep-files",
@@ -119,96 +267,46 @@ def main():
         action="store_true",
         help="Skip Airtable logging (useful for testing)"
     )
+    parser.add_argument(
+        "--force-summarize",
+        action="store_true",
+        help="Re-fetch and re-summarize even if a cached summary exists in .tmp/"
+    )
 
     args = parser.parse_args()
-    recording_id = args.recording_id
+    recording_ids = list(dict.fromkeys(args.recording_ids))  # drop duplicates, keep order
 
     # Display start message
     print_header("MEETING AUTOMATION PIPELINE")
-    print(f"Recording ID: {recording_id}")
+    print(f"Recording ID{'s' if len(recording_ids) > 1 else ''}: {', '.join(recording_ids)}")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    start_time = datetime.now()
-
     try:
-        # =====================================================================
-        # STEP 1: Fetch Transcript
-        # =====================================================================
-        print_step(1, 3, "Fetching transcript from Fathom")
-
-        run_tool("fetch_fathom_transcript.py", [recording_id])
-
-        transcript_file = Path(".tmp") / f"transcript_{recording_id}.json"
-        if not transcript_file.exists():
-            raise ProcessingError("Transcript file was not created")
-
-        # =====================================================================
-        # STEP 2: Generate Summary
-        # =====================================================================
-        print_step(2, 3, "Generating AI summary with Gemini")
-
-        run_tool("summarize_with_gemini.py", [str(transcript_file)])
-
-        summary_file = Path(".tmp") / f"summary_{recording_id}.json"
-        if not summary_file.exists():
-            raise ProcessingError("Summary file was not created")
-
-        # =====================================================================
-        # STEP 3: Log to Airtable
-        # =====================================================================
-        if not args.skip_airtable:
-            print_step(3, 3, "Logging to Airtable")
-
-            run_tool("log_to_airtable.py", [str(summary_file), str(transcript_file)])
+        if len(recording_ids) == 1:
+            ok = [try_process_recording(
+                recording_ids[0], args.keep_files, args.skip_airtable, args.force_summarize
+            )]
         else:
-            print_step(3, 3, "Skipping Airtable (--skip-airtable flag set)")
-            print(f"Summary available at: {summary_file}")
-
-        # =====================================================================
-        # CLEANUP
-        # =====================================================================
-        if not args.keep_files:
-            cleanup_files(recording_id)
-        else:
-            print("\n✓ Keeping intermediate files (--keep-files flag set)")
-            print(f"  - {transcript_file}")
-            print(f"  - {summary_file}")
-
-        # =====================================================================
-        # SUCCESS
-        # =====================================================================
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
-
-        print_header("PIPELINE COMPLETE")
-        print(f"✓ Recording {recording_id} processed successfully")
-        print(f"✓ Total duration: {duration:.1f} seconds")
-
-        if not args.skip_airtable:
-            print("\n✓ Meeting and tasks logged to Airtable")
-            print("  Check your Airtable base for the new records")
-        else:
-            print(f"\n✓ Summary saved to: {summary_file}")
-            print("  Run log_to_airtable.py manually when ready")
-
-        print("\n" + "="*80)
-
-        return 0
-
-    except ProcessingError as e:
-        print(f"\n✗ PIPELINE FAILED: {e}", file=sys.stderr)
-        print("\nPartial results may be available in .tmp/", file=sys.stderr)
-        return 1
+            # Each tool call blocks on network I/O, so threads overlap them
+            workers = min(MAX_PARALLEL_RECORDINGS, len(recording_ids))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                ok = list(executor.map(
+                    lambda rid: try_process_recording(
+                        rid, args.keep_files, args.skip_airtable, args.force_summarize
+                    ),
+                    recording_ids,
+                ))
 
     except KeyboardInterrupt:
         print("\n\n✗ Pipeline interrupted by user", file=sys.stderr)
         return 130
 
-    except Exception as e:
-        print(f"\n✗ UNEXPECTED ERROR: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
-        return 1
+    if len(recording_ids) > 1:
+        print_header("BATCH COMPLETE")
+        for recording_id, succeeded in zip(recording_ids, ok):
+            print(f"{'✓' if succeeded else '✗'} {recording_id}")
+
+    return 0 if all(ok) else 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+"""
+Shared location for intermediate files, and a cached JSON loader for them.
+
+Every tool writes its transcripts and summaries under TMP_DIR. Locally this is
+the project's .tmp/ directory (relative to the working directory, as the WAT
+layout expects). On Vercel only /tmp is writable, so it resolves to /tmp/.tmp
+directly instead of relying on the caller to chdir("/tmp") first.
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+# Vercel sets VERCEL=1 in every deployment environment.
+TMP_DIR = Path("/tmp/.tmp") if os.getenv("VERCEL") else Path(".tmp")
+
+# orjson option for transcript files. They are only ever read back by the
+# tools, so skip pretty-printing (hundreds of KB of indentation on long
+# meetings) unless DEBUG is set and a human will be reading them.
+TRANSCRIPT_JSON_OPTION = orjson.OPT_INDENT_2 if os.getenv("DEBUG") else 0
+
+
+def load_json(path: Path) -> Any:
+    """
+    Parse a JSON file, reusing the result while the file is unchanged.
+
+    Within one process (process_meeting runs every step in-process), the
+    transcript is read by both summarize_with_gemini and log_to_airtable;
+    the second load is a cache hit. The key includes mtime and size, so a
+    rewritten file is parsed again.
+
+    The returned object is shared between callers: don't mutate it (the
+    transcript_utils preprocessing cache is the one intended exception,
+    since it is derived from the same data).
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        orjson.JSONDecodeError: If the file isn't valid JSON
+    """
+    st = path.stat()
+    return _load_json_cached(str(path.resolve()), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    return orjson.loads(Path(path).read_bytes())
@@ -22,15 +22,18 @@ Output:
     Returns: Structured JSON with summary and tasks
 """
 
+import functools
+import io
 import os
 import sys
-import json
-import google.generativeai as genai
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field, ValidationError
 from dotenv import load_dotenv
+from storage import TMP_DIR, load_json
+from transcript_utils import get_preprocessed
 
 # Load environment variables
 load_dotenv()
@@ -38,7 +41,13 @@ load_dotenv()
 # Constants
 GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY")
 GEMINI_MODEL = "gemini-2.5-flash"
-OUTPUT_DIR = Path(".tmp")
+
+# Long transcripts are summarized map-reduce style (see summarize_long):
+# parts of ~CHUNK_CHARS are summarized in parallel, then merged.
+LONG_TRANSCRIPT_CHARS = 150_000   # ~37k tokens, a meeting of several hours
+CHUNK_CHARS = 15_000
+MAX_PARALLEL_CHUNKS = 4
+OUTPUT_DIR = TMP_DIR
 
 
 # ============================================================================
@@ -116,11 +125,81 @@ class MeetingSummary(BaseModel):
         }
 
 
+class PartialSummary(BaseModel):
+    """Schema for the summary of one part of a long meeting (map step)."""
+    key_takeaways: List[str] = Field(
+        default_factory=list,
+        description="Important insights or decisions from this part, in Hebrew"
+    )
+    topics: List[Topic] = Field(
+        default_factory=list,
+        description="Topics discussed in this part, in Hebrew"
+    )
+    action_items: List[Task] = Field(
+        default_factory=list,
+        description="Actionable tasks from this part, in Hebrew"
+    )
+    participants_mentioned: List[str] = Field(
+        default_factory=list,
+        description="Names of participants mentioned in this part"
+    )
+
+
 class GeminiAPIError(Exception):
     """Custom exception for Gemini API errors."""
     pass
 
 
+def _gemini_schema(schema: dict, defs: Optional[dict] = None) -> dict:
+    """
+    Reduce a Pydantic JSON schema to the OpenAPI subset Gemini's
+    response_schema accepts: $refs inlined, Optional[X] as nullable X,
+    no titles, examples or defaults.
+
+    Args:
+        schema: Output of BaseModel.model_json_schema() (or a node of it)
+        defs: The root schema's $defs (found automatically at the root)
+
+    Returns:
+        Schema dict suitable for generation_config["response_schema"]
+    """
+    if defs is None:
+        defs = schema.get("$defs", {})
+
+    if "$ref" in schema:
+        schema = defs[schema["$ref"].rsplit("/", 1)[-1]]
+
+    if "anyOf" in schema:
+        # Optional[X] → X with nullable=True
+        variant = next(s for s in schema["anyOf"] if s.get("type") != "null")
+        reduced = _gemini_schema(variant, defs)
+        reduced["nullable"] = True
+        if "description" in schema:
+            reduced["description"] = schema["description"]
+        return reduced
+
+    reduced = {k: schema[k] for k in ("type", "description", "enum", "required") if k in schema}
+    if "properties" in schema:
+        reduced["properties"] = {k: _gemini_schema(v, defs) for k, v in schema["properties"].items()}
+    if "items" in schema:
+        reduced["items"] = _gemini_schema(schema["items"], defs)
+    return reduced
+
+
+# JSON mode: Gemini returns a bare JSON document matching MeetingSummary,
+# so there are no markdown fences to strip and no formatting tokens spent.
+GENERATION_CONFIG = {
+    "temperature": 0.2,  # Low temperature for more deterministic output
+    "top_p": 0.8,
+    "top_k": 40,
+    "max_output_tokens": 8192,
+    "response_mime_type": "application/json",
+    "response_schema": _gemini_schema(MeetingSummary.model_json_schema()),
+}
+
+PARTIAL_RESPONSE_SCHEMA = _gemini_schema(PartialSummary.model_json_schema())
+
+
 # ============================================================================
 # CORE FUNCTIONS
 # ============================================================================
@@ -146,13 +225,12 @@ def load_transcript(file_path: Path) -> dict:
 
     Raises:
         FileNotFoundError: If the file doesn't exist
-        json.JSONDecodeError: If the file isn't valid JSON
+        orjson.JSONDecodeError: If the file isn't valid JSON
     """
     if not file_path.exists():
         raise FileNotFoundError(f"Transcript file not found: {file_path}")
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(file_path)
 
     print(f"✓ Loaded transcript from {file_path}")
     return data
@@ -168,49 +246,46 @@ def format_transcript_for_gemini(data: dict) -> str:
     Returns:
         Formatted transcript string
     """
-    # Extract metadata
-    title = data.get('title', 'Untitled Meeting')
-    date = data.get('date', 'Unknown date')
-    participants = data.get('participants', [])
-
-    # Build formatted text
-    lines = [
-        f"MEETING: {title}",
-        f"DATE: {date}",
-        f"PARTICIPANTS: {', '.join(participants) if participants else 'Not specified'}",
-        "",
-        "TRANSCRIPT:",
-        "=" * 80,
-        ""
-    ]
+    # Build formatted text straight into one buffer: no per-line list the
+    # length of the transcript held alongside the joined result
+    buf = io.StringIO()
+    write = buf.write
+    write(format_meeting_header(data))
+    write("\n")
+    write("TRANSCRIPT:\n")
+    write("=" * 80)
+    write("\n")
 
     # Add transcript segments
-    transcript = data.get('transcript', [])
-    for segment in transcript:
-        speaker = segment.get('speaker', 'Unknown')
-        text = segment.get('text', '')
-        timestamp = segment.get('timestamp', '')
-        lines.append(f"[{timestamp}] {speaker}: {text}")
+    for timestamp, speaker, text in get_preprocessed(data).speaker_segments:
+        write(f"\n[{timestamp}] {speaker}: {text}")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
-def create_prompt(transcript_text: str) -> str:
-    """
-    Create the prompt for Gemini with Hebrew output instructions.
+def format_meeting_header(data: dict) -> str:
+    """Return the MEETING/DATE/PARTICIPANTS lines that open every prompt."""
+    title = data.get('title', 'Untitled Meeting')
+    date = data.get('date', 'Unknown date')
+    participants = data.get('participants') or get_preprocessed(data).participants
 
-    Args:
-        transcript_text: The formatted transcript
+    return (
+        f"MEETING: {title}\n"
+        f"DATE: {date}\n"
+        f"PARTICIPANTS: {', '.join(participants) if participants else 'Not specified'}\n"
+    )
 
-    Returns:
-        Complete prompt string in Hebrew
-    """
-    prompt = f"""You are Convobot — a professional meeting & conversation summarizer.
+
+# Static parts of the prompt, built once at import; only the transcript
+# in between changes per call
+_PROMPT_PREFIX = """You are Convobot — a professional meeting & conversation summarizer.
 
 Your job is to turn raw, messy, or unstructured conversation transcripts into clear and concise summaries — written in **Hebrew only**.
 The tone should be natural, professional, and easy to read — as if written by a human native speaker.
 
-{transcript_text}
+"""
+
+_PROMPT_SUFFIX = """
 
 🧠 Behavior Guidelines:
 - Never translate or explain — output must always be written natively in Hebrew
@@ -221,7 +296,7 @@ The tone should be natural, professional, and easy to read — as if written by
 
 Return your analysis as valid JSON with the following structure (all text fields in Hebrew):
 
-{{
+{
   "meeting_title": "כותרת מקצועית של הפגישה בעברית",
   "meeting_purpose": "משפט קצר המתאר את תכלית הפגישה",
   "key_takeaways": [
@@ -229,61 +304,82 @@ Return your analysis as valid JSON with the following structure (all text fields
     "תובנה או החלטה חשובה 2"
   ],
   "topics": [
-    {{
+    {
       "title": "כותרת הנושא",
       "description": "1-3 משפטים על הנושא"
-    }}
+    }
   ],
   "action_items": [
-    {{
+    {
       "title": "כותרת המשימה בעברית",
       "description": "תיאור מפורט של מה צריך לעשות",
       "owner": "שם האחראי או null",
       "priority": "High|Medium|Low",
       "due_date": "YYYY-MM-DD או null",
       "context": "הקשר רלוונטי מהפגישה"
-    }}
+    }
   ],
   "participants_mentioned": ["רשימת שמות המשתתפים"]
-}}
+}
 
-CRITICAL: Return ONLY valid JSON, no markdown code blocks or formatting. All text content must be in Hebrew except for: owner names, dates, and priority levels.
+CRITICAL: All text content must be in Hebrew except for: owner names, dates, and priority levels.
 """
-    return prompt
 
 
-def call_gemini(prompt: str) -> dict:
+def create_prompt(transcript_text: str) -> str:
+    """
+    Create the prompt for Gemini with Hebrew output instructions.
+
+    Args:
+        transcript_text: The formatted transcript
+
+    Returns:
+        Complete prompt string in Hebrew
+    """
+    return "".join((_PROMPT_PREFIX, transcript_text, _PROMPT_SUFFIX))
+
+
+@functools.lru_cache(maxsize=1)
+def _model():
+    """
+    Configure the SDK and build the model object once per process.
+
+    Deferred to the first call (not import) so validate_environment() can
+    report a missing key first; later calls, e.g. several recordings in one
+    process_meeting run, reuse the same model. The SDK itself is imported
+    here too: it is the slowest import in the pipeline, and usage or
+    environment errors shouldn't pay for it.
+    """
+    import google.generativeai as genai
+
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel(GEMINI_MODEL)
+
+
+def call_gemini(prompt: str, response_schema: Optional[dict] = None) -> str:
     """
     Call Gemini API to generate structured summary.
 
     Args:
         prompt: The complete prompt
+        response_schema: JSON schema for the answer (default: MeetingSummary)
 
     Returns:
-        Dict with the structured response
+        The raw JSON text of the response (parsed by validate_with_pydantic)
 
     Raises:
         GeminiAPIError: If the API call fails
     """
     try:
-        # Configure Gemini
-        genai.configure(api_key=GEMINI_API_KEY)
-
-        # Initialize model
-        model = genai.GenerativeModel(GEMINI_MODEL)
+        model = _model()
 
         print(f"Calling Gemini {GEMINI_MODEL}...")
 
         # Generate content
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "temperature": 0.2,  # Low temperature for more deterministic output
-                "top_p": 0.8,
-                "top_k": 40,
-                "max_output_tokens": 8192,
-            }
-        )
+        generation_config = GENERATION_CONFIG
+        if response_schema is not None:
+            generation_config = {**GENERATION_CONFIG, "response_schema": response_schema}
+        response = model.generate_content(prompt, generation_config=generation_config)
 
         # Extract text
         if not response.text:
@@ -291,42 +387,31 @@ def call_gemini(prompt: str) -> dict:
 
         print("✓ Received response from Gemini")
 
-        # Parse JSON
-        # Remove markdown code blocks if present
-        response_text = response.text.strip()
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.startswith("```"):
-            response_text = response_text[3:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
-        result = json.loads(response_text)
-        return result
-
-    except json.JSONDecodeError as e:
-        raise GeminiAPIError(f"Failed to parse Gemini response as JSON: {e}\nResponse: {response.text[:500]}")
+        # JSON mode: the text is the JSON document, no markdown fences to strip
+        return response.text
 
     except Exception as e:
         raise GeminiAPIError(f"Gemini API call failed: {e}")
 
 
-def validate_with_pydantic(data: dict) -> MeetingSummary:
+def validate_with_pydantic(raw_json: str) -> MeetingSummary:
     """
-    Validate the Gemini response against our Pydantic schema.
+    Parse and validate the Gemini response against our Pydantic schema.
+
+    model_validate_json() parses and validates in one pass in pydantic-core,
+    without building an intermediate dict.
 
     Args:
-        data: The raw response from Gemini
+        raw_json: The raw JSON text from Gemini
 
     Returns:
         Validated MeetingSummary object
 
     Raises:
-        ValidationError: If the data doesn't match the schema
+        ValidationError: If the text is not valid JSON or doesn't match the schema
     """
     try:
-        summary = MeetingSummary(**data)
+        summary = MeetingSummary.model_validate_json(raw_json)
         print("✓ Response validated against schema")
         return summary
     except ValidationError as e:
@@ -348,14 +433,13 @@ def save_summary(recording_id: str, summary: MeetingSummary) -> Path:
         Path to the saved file
     """
     # Ensure output directory exists
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     # Create output file path
     output_file = OUTPUT_DIR / f"summary_{recording_id}.json"
 
-    # Write data (use model_dump for Pydantic v2)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(summary.model_dump(), f, indent=2, ensure_ascii=False)
+    # Serialize straight from the model (no intermediate dict)
+    output_file.write_text(summary.model_dump_json(indent=2), encoding="utf-8")
 
     print(f"✓ Summary saved to: {output_file}")
     return output_file
@@ -394,6 +478,163 @@ def display_summary(summary: MeetingSummary) -> None:
     print("="*80)
 
 
+# ============================================================================
+# LONG TRANSCRIPTS (MAP-REDUCE)
+# ============================================================================
+
+def chunk_segments(speaker_segments: list, chunk_chars: int) -> List[str]:
+    """
+    Split the transcript into consecutive parts of about chunk_chars each.
+
+    Segments are chronological, so each part is a contiguous time window.
+    A segment is never split; a single oversized segment becomes its own part.
+
+    Args:
+        speaker_segments: (timestamp, speaker, text) tuples
+        chunk_chars: Target characters per part
+
+    Returns:
+        List of formatted transcript parts
+    """
+    chunks = []
+    lines = []
+    size = 0
+    for timestamp, speaker, text in speaker_segments:
+        line = f"[{timestamp}] {speaker}: {text}"
+        if lines and size + len(line) > chunk_chars:
+            chunks.append("\n".join(lines))
+            lines = []
+            size = 0
+        lines.append(line)
+        size += len(line) + 1
+    if lines:
+        chunks.append("\n".join(lines))
+    return chunks
+
+
+def create_chunk_prompt(header: str, chunk_text: str, part: int, total: int) -> str:
+    """Create the map-step prompt for one part of a long meeting."""
+    return f"""You are Convobot — a professional meeting & conversation summarizer.
+
+Below is PART {part} of {total} of a long meeting transcript. Extract what matters in this part, written in **Hebrew only**:
+- key_takeaways: important insights or decisions
+- topics: topics discussed, 1-3 sentences each
+- action_items: concrete tasks (owner or null, priority High|Medium|Low, due_date YYYY-MM-DD or null)
+- participants_mentioned: names mentioned
+
+Skip chit-chat and filler. Owner names, dates, and priority levels stay as they are.
+
+{header}
+TRANSCRIPT (PART {part}/{total}):
+{"=" * 80}
+{chunk_text}
+"""
+
+
+def create_reduce_prompt(header: str, partials: List[PartialSummary]) -> str:
+    """Create the reduce-step prompt: the regular prompt over part summaries."""
+    total = len(partials)
+    parts = "\n\n".join(
+        f"PART {i}/{total}:\n{partial.model_dump_json()}"
+        for i, partial in enumerate(partials, 1)
+    )
+    return "".join((
+        _PROMPT_PREFIX,
+        header,
+        "\nThis meeting was long, so instead of the raw transcript you get summaries "
+        "of its consecutive parts, in order. Merge them into one summary of the whole "
+        "meeting: combine related topics and list each action item once.\n\n",
+        parts,
+        _PROMPT_SUFFIX,
+    ))
+
+
+def summarize_chunk(header: str, chunk_text: str, part: int, total: int) -> PartialSummary:
+    """Map step: summarize one part of the meeting."""
+    raw_json = call_gemini(create_chunk_prompt(header, chunk_text, part, total), PARTIAL_RESPONSE_SCHEMA)
+    return PartialSummary.model_validate_json(raw_json)
+
+
+def summarize_long(transcript_data: dict) -> MeetingSummary:
+    """
+    Summarize a very long transcript map-reduce style.
+
+    The transcript is split into ~CHUNK_CHARS parts that are summarized in
+    parallel (threads: each call blocks on the network). A final call merges
+    the part summaries, so no single prompt carries the whole transcript.
+
+    Args:
+        transcript_data: The transcript data (Fathom shape)
+
+    Returns:
+        Validated MeetingSummary object
+
+    Raises:
+        GeminiAPIError: If an API call fails
+        ValidationError: If a response doesn't match its schema
+    """
+    header = format_meeting_header(transcript_data)
+    chunks = chunk_segments(get_preprocessed(transcript_data).speaker_segments, CHUNK_CHARS)
+    total = len(chunks)
+    print(f"Long transcript: summarizing {total} parts, then merging")
+
+    workers = min(MAX_PARALLEL_CHUNKS, total)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(summarize_chunk, header, chunk, part, total)
+            for part, chunk in enumerate(chunks, 1)
+        ]
+        partials = [future.result() for future in futures]
+
+    print(f"✓ Summarized {total} parts")
+    return validate_with_pydantic(call_gemini(create_reduce_prompt(header, partials)))
+
+
+def summarize(transcript_data: dict) -> MeetingSummary:
+    """
+    Run the Gemini summarization on an already-loaded transcript.
+
+    Args:
+        transcript_data: The transcript data (Fathom shape)
+
+    Returns:
+        Validated MeetingSummary object
+
+    Raises:
+        GeminiAPIError: If the API call fails
+        ValidationError: If the response doesn't match the schema
+    """
+    # Very long meetings: summarize parts in parallel, then merge
+    if len(get_preprocessed(transcript_data).plain_text) >= LONG_TRANSCRIPT_CHARS:
+        return summarize_long(transcript_data)
+
+    # Format transcript for Gemini
+    transcript_text = format_transcript_for_gemini(transcript_data)
+
+    # Create prompt
+    prompt = create_prompt(transcript_text)
+
+    # Call Gemini
+    response = call_gemini(prompt)
+
+    # Validate with Pydantic
+    return validate_with_pydantic(response)
+
+
+def run(transcript_data: dict) -> dict:
+    """
+    In-process entry point used by the webhook and the orchestrator.
+
+    Takes the transcript dict directly (no file round trip) and returns the
+    summary as a plain dict, the shape log_to_airtable.run() consumes.
+    Errors propagate to the caller instead of being mapped to exit codes.
+    """
+    validate_environment()
+    summary = summarize(transcript_data)
+    display_summary(summary)
+    return summary.model_dump()
+
+
 def main(transcript_file: Optional[Path] = None):
     """Main execution function."""
     # Check for transcript file argument if not provided
@@ -415,17 +656,8 @@ def main(transcript_file: Optional[Path] = None):
         # Extract recording ID from filename
         recording_id = transcript_file.stem.replace("transcript_", "")
 
-        # Format transcript for Gemini
-        transcript_text = format_transcript_for_gemini(transcript_data)
-
-        # Create prompt
-        prompt = create_prompt(transcript_text)
-
-        # Call Gemini
-        response = call_gemini(prompt)
-
-        # Validate with Pydantic
-        summary = validate_with_pydantic(response)
+        # Summarize with Gemini
+        summary = summarize(transcript_data)
 
         # Save summary
         output_file = save_summary(recording_id, summary)
@@ -436,7 +668,6 @@ def main(transcript_file: Optional[Path] = None):
         # Success
         print(f"\n✓ SUCCESS: Summary ready at {output_file}")
         return 0
-
     except EnvironmentError as e:
         print(f"\n✗ ENVIRONMENT ERROR: {e}", file=sys.stderr)
         return 1
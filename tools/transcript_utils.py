@@ -0,0 +1,135 @@
+"""
+Single-pass transcript preprocessing shared by the webhook and the tools.
+
+The webhook (participants header), summarize_with_gemini (prompt lines) and
+log_to_airtable (attendees + raw transcript fields) each used to walk the full
+transcript on their own. preprocess() walks it exactly once and produces
+everything they need; get_preprocessed() caches that result on the transcript
+dict so every later caller in the same process reuses it.
+
+The cache lives under PREPROCESSED_KEY inside the transcript dict. It is not
+JSON-serializable — use serializable() before writing the dict anywhere.
+
+participants() is the cheap names-only walk for callers that need nothing
+else (the webhook's 202 path, where the full pass happens later in the worker).
+
+Fathom segment shape:
+    transcript[].speaker.display_name
+    transcript[].speaker.matched_calendar_invitee_email  (nullable)
+    transcript[].text
+    transcript[].timestamp
+"""
+
+import io
+from typing import List, NamedTuple, Tuple
+
+PREPROCESSED_KEY = "_preprocessed"
+
+# Shared stand-in for a missing speaker object; never mutated
+_EMPTY = {}
+
+
+class PreprocessedTranscript(NamedTuple):
+    """Everything downstream code derives from the transcript segments."""
+    participants: List[str]                       # unique display names, first-seen order
+    plain_text: str                               # "Speaker: text" blocks, blank-line separated
+    attendees: str                                # comma-separated emails (or names)
+    speaker_segments: List[Tuple[str, str, str]]  # (timestamp, speaker, text)
+
+
+def preprocess(transcript: list) -> PreprocessedTranscript:
+    """
+    Walk the transcript segments once, accumulating all derived views.
+
+    Args:
+        transcript: List of Fathom transcript segments
+
+    Returns:
+        PreprocessedTranscript with participants, plain text, attendees
+        and (timestamp, speaker, text) tuples
+    """
+    seen = {}  # display_name -> email or name (insertion order = first seen)
+    plain = io.StringIO()   # "Speaker: text" blocks, written as we go
+    sep = ""
+    speaker_segments = []
+
+    # Bound methods hoisted out of the per-segment loop
+    write = plain.write
+    append_segment = speaker_segments.append
+
+    for segment in transcript:
+        speaker = segment.get("speaker") or _EMPTY
+        if isinstance(speaker, dict):
+            name = speaker.get("display_name") or "Unknown"
+            email = speaker.get("matched_calendar_invitee_email")
+        else:
+            name = str(speaker)
+            email = None
+        text = segment.get("text") or ""
+
+        # Keep the email if we find one; don't downgrade to name if already set.
+        # Speakers repeat across segments, so the common case is one lookup.
+        if email:
+            seen[name] = email
+        elif name not in seen:
+            seen[name] = name
+
+        write(sep)
+        write(name)
+        write(": ")
+        write(text)
+        sep = "\n\n"
+        append_segment((segment.get("timestamp", ""), name, text))
+
+    attendees = list(seen.values())
+    return PreprocessedTranscript(
+        participants=list(seen),
+        plain_text=plain.getvalue(),
+        attendees=", ".join(attendees) if attendees else "No attendees",
+        speaker_segments=speaker_segments,
+    )
+
+
+def participants(transcript: list) -> List[str]:
+    """
+    Unique speaker display names in first-seen order, without the full pass.
+
+    Matches PreprocessedTranscript.participants.
+
+    Args:
+        transcript: List of Fathom transcript segments
+
+    Returns:
+        List of display names
+    """
+    seen = {}
+    for segment in transcript:
+        speaker = segment.get("speaker") or _EMPTY
+        if isinstance(speaker, dict):
+            name = speaker.get("display_name") or "Unknown"
+        else:
+            name = str(speaker)
+        seen[name] = None
+    return list(seen)
+
+
+def get_preprocessed(transcript_data: dict) -> PreprocessedTranscript:
+    """
+    Return preprocess() output for a transcript dict, computing it on first use.
+
+    Args:
+        transcript_data: The transcript data (Fathom shape)
+
+    Returns:
+        The cached PreprocessedTranscript
+    """
+    cached = transcript_data.get(PREPROCESSED_KEY)
+    if cached is None:
+        cached = preprocess(transcript_data.get("transcript", ()))
+        transcript_data[PREPROCESSED_KEY] = cached
+    return cached
+
+
+def serializable(transcript_data: dict) -> dict:
+    """Shallow copy of transcript_data without the preprocessing cache."""
+    return {k: v for k, v in transcript_data.items() if k != PREPROCESSED_KEY}